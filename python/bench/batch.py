@@ -0,0 +1,37 @@
+"""Parses a synthetic corpus of feature files with gherkin.batch on a
+growing pool of processes.
+
+    cd python && python -m bench.batch
+"""
+
+import multiprocessing
+import os.path
+import shutil
+import tempfile
+
+from gherkin import batch
+
+from bench.support import FeatureBuilder, timed
+
+def write_corpus(path, count):
+    builder = FeatureBuilder()
+    for i in range(count):
+        feature = builder.feature(scenarios=20, table_rows=3)
+        with open(os.path.join(path, 'f%04d.feature' % i), 'w') as f:
+            f.write(feature.encode('utf8'))
+
+def main():
+    path = tempfile.mkdtemp()
+    try:
+        write_corpus(path, 400)
+        processes = 1
+        while processes <= max(multiprocessing.cpu_count(), 4):
+            timed('%d processes' % processes,
+                  lambda: list(batch.parse_files([path], processes)),
+                  repeat=3)
+            processes *= 2
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == '__main__':
+    main()
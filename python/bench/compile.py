@@ -0,0 +1,106 @@
+"""Compiles features with a background and an outline into pickles, with
+gherkin.compile and with a formatter that copies the background into every
+scenario and expands outlines by replacing placeholders row by row.
+
+    cd python && python -m bench.compile
+"""
+
+import copy
+
+from gherkin.compile import Compiler
+from gherkin.parser import Parser
+
+from bench.model_memory import size
+from bench.support import FeatureBuilder, timed
+
+class NaiveCompiler(object):
+    def __init__(self):
+        self.pickles = []
+        self.feature_tags = []
+        self.background_steps = []
+        self.current = None
+        self.outline = None
+
+    def __getattr__(self, name):
+        return self.ignore
+
+    def ignore(self, *args):
+        pass
+
+    def feature(self, feature):
+        self.feature_tags = [tag.name for tag in feature.tags]
+        self.background_steps = []
+        self.current = self.background_steps
+
+    def background(self, background):
+        self.current = self.background_steps
+
+    def scenario(self, scenario):
+        self.outline = None
+        steps = copy.deepcopy(self.background_steps)
+        self.current = steps
+        self.pickles.append({
+            'name': scenario.name,
+            'tags': self.feature_tags + [tag.name for tag in scenario.tags],
+            'steps': steps,
+        })
+
+    def scenario_outline(self, scenario_outline):
+        self.outline = scenario_outline
+        self.current = self.outline_steps = []
+
+    def step(self, step):
+        self.current.append(step.to_dict())
+
+    def examples(self, examples):
+        header = examples.rows[0].cells
+        tags = self.feature_tags + [tag.name for tag in self.outline.tags] + \
+            [tag.name for tag in examples.tags]
+        for row in examples.rows[1:]:
+            name = self.outline.name
+            for column, value in zip(header, row.cells):
+                name = name.replace(u'<%s>' % column, value)
+            steps = copy.deepcopy(self.background_steps)
+            for step in self.outline_steps:
+                step = copy.deepcopy(step)
+                for name, value in zip(header, row.cells):
+                    step['name'] = step['name'].replace(u'<%s>' % name, value)
+                steps.append(step)
+            self.pickles.append({'name': name, 'tags': tags,
+                                 'steps': steps})
+
+def source():
+    builder = FeatureBuilder()
+    lines = [u'@feature', u'Feature: Compile', u'  Background:']
+    lines.extend(u'    Given ' + builder.words(6) for i in range(5))
+    lines.extend(builder.table(3, 3))
+    text = builder.feature(scenarios=500, steps=5)
+    lines.extend(text.splitlines()[1:])
+    lines.extend([u'  @outline', u'  Scenario Outline: Many',
+                  u'    Given <a> and <b>', u'    Then <c>',
+                  u'    Examples:', u'      | a | b | c |'])
+    lines.extend(builder.table(2000, 3))
+    return u'\n'.join(lines) + u'\n'
+
+def naive(text):
+    compiler = NaiveCompiler()
+    Parser(compiler).parse(text, 'f.feature', 0)
+    return compiler.pickles
+
+def compiled(text):
+    pickles = []
+    Parser(Compiler(pickles.append)).parse(text, 'f.feature', 0)
+    return pickles
+
+def main():
+    text = source()
+    print '%d pickles' % len(compiled(text))
+    timed('naive', lambda: naive(text), repeat=3)
+    timed('gherkin.compile', lambda: compiled(text), repeat=3)
+    for name, function in (('naive', naive), ('gherkin.compile', compiled)):
+        pickles = function(text)
+        print '%-40s %8.1f MB' % (name + ' memory',
+                                  size(pickles, set()) / 1024.0 / 1024.0)
+
+if __name__ == '__main__':
+    main()
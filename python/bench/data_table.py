@@ -0,0 +1,67 @@
+"""Parses a scenario outline with 50k examples rows into Rows and into a
+columnar DataTable, and compares their memory and iteration speed.
+
+    cd python && python -m bench.data_table
+"""
+
+import sys
+
+from gherkin.formatter import model
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, timed
+
+class ExamplesCollector(object):
+    def __getattr__(self, name):
+        return self.ignore
+
+    def ignore(self, *args):
+        pass
+
+    def examples(self, examples):
+        self.rows = examples.rows
+
+def size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    total = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        total += sum(size(item, seen) for item in obj)
+    elif isinstance(obj, dict):
+        total += sum(size(key, seen) + size(value, seen)
+                     for key, value in obj.items())
+    elif isinstance(obj, (model.Dictable, model.DataTable)):
+        total += sum(size(getattr(obj, name), seen)
+                     for name in obj.__slots__ if name != '_description')
+        if isinstance(obj, model.Row):
+            total += size(obj.comments, seen)
+    return total
+
+def parse(source, columnar):
+    collector = ExamplesCollector()
+    Parser(collector, columnar=columnar).parse(source, 'f.feature', 0)
+    return collector.rows
+
+def main():
+    builder = FeatureBuilder()
+    lines = [u'Feature: Data', u'  Scenario Outline: Many',
+             u'    Given <a> and <b>', u'    Examples:', u'      | a | b | c |']
+    lines.extend(builder.table(50000, 3))
+    source = u'\n'.join(lines) + u'\n'
+
+    rows = parse(source, False)
+    table = parse(source, True)
+    for name, value in (('Rows', rows), ('DataTable', table)):
+        print '%-40s %8.1f MB' % (name + ' memory',
+                                  size(value, set()) / 1024.0 / 1024.0)
+    timed('parse to Rows', lambda: parse(source, False), repeat=3)
+    timed('parse to DataTable', lambda: parse(source, True), repeat=3)
+    timed('Rows: cells of column a', lambda: [row.cells[0] for row in rows])
+    timed('DataTable.column(a)', lambda: table.column(u'a'))
+    timed('Rows: hashes', lambda: [dict(zip(rows[0].cells, row.cells))
+                                   for row in rows[1:]])
+    timed('DataTable.hashes()', table.hashes)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""Times fresh interpreters that import the parser and look up a language,
+as a short-lived command line run would. Run it before and after
+gherkin.i18n.compile_languages() has generated gherkin/i18n_data.py.
+
+    cd python && python -m bench.i18n_import
+"""
+
+import subprocess
+import sys
+
+from bench.support import timed
+
+STARTUP = "from gherkin.i18n import I18n; I18n.get('en'); import gherkin.parser"
+
+def main():
+    timed('python -c pass', lambda: subprocess.check_call(
+        [sys.executable, '-c', 'pass']))
+    timed('import gherkin.parser', lambda: subprocess.check_call(
+        [sys.executable, '-W', 'ignore', '-c', STARTUP]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Edits one step of a large feature, reparsing it whole with Parser and
+incrementally with gherkin.incremental.Document.
+
+    cd python && python -m bench.incremental
+"""
+
+from gherkin.incremental import Document
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, NullListener, timed
+
+def main():
+    builder = FeatureBuilder()
+    source = builder.feature(scenarios=500, table_rows=3)
+    document = Document(source)
+    # A step in the middle of the feature
+    line = len(document.lines) // 2
+    while u'Given' not in document.lines[line - 1]:
+        line += 1
+
+    def edit():
+        document.edit(line, line, u'    Given ' + builder.words(6))
+
+    timed('reparse %d lines' % len(document.lines),
+          lambda: Parser(NullListener()).parse(document.source, None, 0))
+    timed('edit one step', edit, repeat=50)
+
+if __name__ == '__main__':
+    main()
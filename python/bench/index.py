@@ -0,0 +1,46 @@
+"""Indexes a synthetic corpus with gherkin.index, then times tag, line and
+name queries against it.
+
+    cd python && python -m bench.index
+"""
+
+import os.path
+import re
+import shutil
+import tempfile
+import time
+
+from gherkin.index import Index
+
+from bench.support import FeatureBuilder, timed
+
+def write_corpus(path, files, scenarios):
+    builder = FeatureBuilder()
+    for i in range(files):
+        feature = builder.feature(scenarios=scenarios, steps=3)
+        with open(os.path.join(path, 'f%04d.feature' % i), 'w') as f:
+            f.write(feature.encode('utf8'))
+
+def main():
+    path = tempfile.mkdtemp()
+    try:
+        write_corpus(path, 400, 50)
+        index = Index(os.path.join(path, 'index.db'))
+        start = time.time()
+        index.update([path])
+        print '%-40s %8.4fs' % ('index 20000 scenarios',
+                                time.time() - start)
+        timed('refresh unchanged', lambda: index.update([path]))
+        timed('tagged @tag3', lambda: index.tagged(['@tag3']))
+        timed('tagged @tag3,@tag4 ~@smoke',
+              lambda: index.tagged(['@tag3,@tag4', '~@smoke']))
+        uri = os.path.join(path, 'f0200.feature')
+        timed('lines of one file', lambda: index.lines(uri, [10, 100, 200]))
+        timed('named /lorem ipsum/',
+              lambda: index.named([re.compile('lorem ipsum')]))
+        index.close()
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Measures the memory held by the models of a synthetic corpus parsed with
+and without a shared intern pool, and how fast tags are filtered.
+
+    cd python && python -m bench.intern_pool
+"""
+
+from gherkin.formatter import model
+from gherkin.formatter.filters import TagFilter
+from gherkin.parser import Parser
+
+from bench.model_memory import ModelCollector, size
+from bench.support import FeatureBuilder, timed
+
+def parse(features, pool):
+    collector = ModelCollector()
+    for i, feature in enumerate(features):
+        Parser(collector, pool=pool).parse(feature, 'f%d.feature' % i, 0)
+    return [m for m in collector.models if isinstance(m, model.Dictable)]
+
+def main():
+    builder = FeatureBuilder()
+    features = [builder.feature(scenarios=50, steps=5, table_rows=3)
+                for i in range(200)]
+    for name, pool in (('no pool', None), ('corpus pool', {})):
+        models = parse(features, pool)
+        print '%-40s %8.1f MB' % ('10k scenarios, ' + name,
+                                  size(models, set()) / 1024.0 / 1024.0)
+        scenarios = [m for m in models if isinstance(m, model.Scenario)]
+        tag_filter = TagFilter(['@tag3,@tag4', '@smoke'])
+        timed('filter tags, ' + name,
+              lambda: [s for s in scenarios if tag_filter.eval(s.tags, [], [])])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""Compares UniversalLexer.scan() with a listener against
+UniversalLexer.tokenize() on table heavy features.
+
+    cd python && python -m bench.lexer_tokens
+"""
+
+from gherkin.lexer.universal import UniversalLexer
+
+from bench.support import FeatureBuilder, NullListener, timed
+
+def main():
+    source = FeatureBuilder().feature(scenarios=200, steps=3, table_rows=50)
+    listener_lexer = UniversalLexer(NullListener())
+    token_lexer = UniversalLexer(None)
+
+    print '%d characters, %d tokens' % (len(source),
+                                        len(token_lexer.tokenize(source)))
+    timed('scan (listener)', lambda: listener_lexer.scan(source))
+    timed('tokenize', lambda: token_lexer.tokenize(source))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""Scans a corpus of features in several languages with one warm universal
+lexer, and with an I18nLexer that loads the compiled lexer of each
+language.
+
+    cd python && python -m bench.lexer_universal
+"""
+
+from gherkin.lexer.i18n_lexer import I18nLexer
+
+from bench.support import NullListener, fixture, timed
+
+FIXTURES = ('complex.feature', 'i18n_fr.feature', 'i18n_no.feature',
+            'i18n_zh-CN.feature')
+
+def scan_all(lexer, corpus):
+    for source in corpus:
+        lexer.scan(source)
+
+def main():
+    corpus = [fixture(name) for name in FIXTURES] * 100
+    timed('compiled lexers', lambda: scan_all(I18nLexer(NullListener()),
+                                              corpus))
+    universal = I18nLexer(NullListener(), force_universal=True)
+    timed('universal lexer', lambda: scan_all(universal, corpus))
+
+if __name__ == '__main__':
+    main()
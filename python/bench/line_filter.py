@@ -0,0 +1,65 @@
+"""Filters a feature with 2000 scenarios and a 5000-row examples table on
+5000 selected lines, with LineFilter and with the former filter that
+scanned every line for every range.
+
+    cd python && python -m bench.line_filter
+"""
+
+import random
+
+from gherkin.formatter.filter_formatter import FilterFormatter
+from gherkin.formatter.filters import LineFilter
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, NullListener, timed
+
+class ScanningLineFilter(object):
+    def __init__(self, lines):
+        self.lines = lines
+
+    def uri(self, uri):
+        pass
+
+    def eval(self, tags, names, ranges):
+        for r in ranges:
+            for line in self.lines:
+                if r[0] <= line <= r[1]:
+                    return True
+        return False
+
+    def filter_table_body_rows(self, rows):
+        body = [r for r in rows[1:] if r.line in self.lines]
+        return [rows[0]] + body
+
+def source():
+    builder = FeatureBuilder()
+    lines = builder.feature(scenarios=2000, steps=5).splitlines()
+    lines.extend([u'  Scenario Outline: Many', u'    Given <a> and <b>',
+                  u'    Examples:', u'      | a | b |'])
+    lines.extend(builder.table(5000, 2))
+    return u'\n'.join(lines) + u'\n'
+
+def parse(text, line_filter):
+    formatter = FilterFormatter(NullListener(), [1])
+    formatter.filter = line_filter
+    Parser(formatter).parse(text, 'f.feature', 0)
+
+def main():
+    text = source()
+    line_count = text.count(u'\n')
+    lines = random.Random(0).sample(xrange(1, line_count + 1), 5000)
+    timed('scanning filter', lambda: parse(text, ScanningLineFilter(lines)),
+          repeat=1)
+    timed('LineFilter', lambda: parse(text, LineFilter(lines)), repeat=3)
+    by_uri = {'f.feature': lines}
+    by_uri.update(('other%d.feature' % i, lines) for i in range(100))
+    timed('LineFilter of 101 uris', lambda: LineFilter(by_uri), repeat=3)
+    line_filter = LineFilter(by_uri)
+    timed('LineFilter by uri, built once', lambda: parse(text, line_filter),
+          repeat=3)
+    timed('no filter', lambda: Parser(NullListener()).parse(text,
+                                                            'f.feature', 0),
+          repeat=3)
+
+if __name__ == '__main__':
+    main()
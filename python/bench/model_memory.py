@@ -0,0 +1,54 @@
+"""Measures the memory held by the models of 10k parsed scenarios, walking
+them with sys.getsizeof.
+
+    cd python && python -m bench.model_memory
+"""
+
+import sys
+
+from gherkin.formatter import model
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder
+
+class ModelCollector(object):
+    def __init__(self):
+        self.models = []
+
+    def __getattr__(self, name):
+        return self.collect
+
+    def collect(self, *args):
+        self.models.extend(args)
+
+def size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    total = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        total += sum(size(item, seen) for item in obj)
+    elif isinstance(obj, dict):
+        total += sum(size(key, seen) + size(value, seen)
+                     for key, value in obj.items())
+    elif isinstance(obj, model.Dictable):
+        if hasattr(obj, '__dict__'):
+            total += size(obj.__dict__, seen)
+        else:
+            total += sum(size(getattr(obj, name), seen)
+                         for name in type(obj).fields())
+    return total
+
+def main():
+    builder = FeatureBuilder()
+    collector = ModelCollector()
+    parser = Parser(collector)
+    for i in range(100):
+        feature = builder.feature(scenarios=100, steps=5, table_rows=3)
+        parser.parse(feature, 'f%d.feature' % i, 0)
+    models = [m for m in collector.models if isinstance(m, model.Dictable)]
+    print '%-40s %8.1f MB' % ('10k scenarios',
+                              size(models, set()) / 1024.0 / 1024.0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Expands a scenario outline with 10k examples rows, by replacing the
+placeholders of every step for each row and with gherkin.outline, and times
+how long the first scenario takes to come out.
+
+    cd python && python -m bench.outline
+"""
+
+import itertools
+
+from gherkin.formatter import model
+from gherkin.outline import Outline
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, timed
+
+class OutlineCollector(object):
+    def __init__(self):
+        self.outline_steps = []
+        self.outline_examples = []
+
+    def __getattr__(self, name):
+        return self.ignore
+
+    def ignore(self, *args):
+        pass
+
+    def scenario_outline(self, scenario_outline):
+        self.outline = scenario_outline
+
+    def step(self, step):
+        self.outline_steps.append(step)
+
+    def examples(self, examples):
+        self.outline_examples.append(examples)
+
+def replace(text, header, cells):
+    for name, value in zip(header, cells):
+        text = text.replace(u'<%s>' % name, value)
+    return text
+
+def expand_all(collector):
+    # Every scenario is built before the first is used
+    scenarios = []
+    for examples in collector.outline_examples:
+        header = examples.rows[0].cells
+        for row in examples.rows[1:]:
+            steps = []
+            for step in collector.outline_steps:
+                expanded = model.Step(step.comments, step.keyword,
+                                      replace(step.name, header, row.cells),
+                                      step.line)
+                if step.rows:
+                    expanded.rows = [
+                        model.Row(r.comments, [replace(cell, header, row.cells)
+                                               for cell in r.cells], r.line)
+                        for r in step.rows]
+                steps.append(expanded)
+            scenarios.append((replace(collector.outline.name, header,
+                                      row.cells), steps))
+    return scenarios
+
+def main():
+    builder = FeatureBuilder()
+    lines = [u'Feature: Outline', u'  Scenario Outline: Eat <a>',
+             u'    Given I have <a> and <b>', u'      | x   | y   |',
+             u'      | <a> | <c> |', u'    When I eat <b>',
+             u'    Then I have <c> left but not <d>', u'    Examples:',
+             u'      | a | b | c |']
+    lines.extend(builder.table(10000, 3))
+    source = u'\n'.join(lines) + u'\n'
+
+    for columnar in (False, True):
+        collector = OutlineCollector()
+        Parser(collector, columnar=columnar).parse(source, 'f.feature', 0)
+        outline = lambda: Outline(collector.outline, collector.outline_steps,
+                                  collector.outline_examples)
+        suffix = columnar and ' (columnar)' or ''
+        timed('replace per row' + suffix, lambda: expand_all(collector),
+              repeat=3)
+        timed('Outline.scenarios()' + suffix,
+              lambda: list(outline().scenarios()), repeat=3)
+        timed('Outline.scenarios(), first 10' + suffix,
+              lambda: list(itertools.islice(outline().scenarios(), 10)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Parses a batch of features into the JSON formatter without a cache, into
+an empty ParseCache and again from the filled cache.
+
+    cd python && python -m bench.parse_cache
+"""
+
+import shutil
+import tempfile
+
+from gherkin.cache import ParseCache
+from gherkin.formatter.json_formatter import JSONFormatter
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, timed
+
+def parse(features, cache=None):
+    parser = Parser(JSONFormatter(None), cache=cache)
+    for i, feature in enumerate(features):
+        parser.parse(feature, 'f%d.feature' % i, 0)
+
+def main():
+    builder = FeatureBuilder()
+    features = [builder.feature(scenarios=30, table_rows=5,
+                                description_lines=2)
+                for i in range(100)]
+    path = tempfile.mkdtemp()
+    try:
+        timed('no cache', lambda: parse(features))
+        timed('empty cache', lambda: parse(features, ParseCache(path)),
+              repeat=1)
+        timed('filled cache', lambda: parse(features, ParseCache(path)))
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Pushes the events of tag and comment heavy features through the Parser
+methods the lexer calls, which run the parser's state machines and build the
+model.
+
+    cd python && python -m bench.parser_events
+"""
+
+from gherkin.lexer.universal import UniversalLexer
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, NullListener, timed
+
+class EventRecorder(object):
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.events.append((name, args))
+        return record
+
+def heavy_feature(builder, scenarios):
+    lines = [u'# language: en', u'@feature @tags',
+             u'Feature: ' + builder.words(3)]
+    for i in range(scenarios):
+        lines.append(u'  # ' + builder.words(5))
+        lines.append(u'  @a%d @b @c @d' % i)
+        lines.append(u'  @e @f')
+        lines.append(u'  Scenario: ' + builder.words(4))
+        for j in range(4):
+            lines.append(u'    # ' + builder.words(3))
+            lines.append(u'    Given ' + builder.words(6))
+    return u'\n'.join(lines) + u'\n'
+
+def replay(events):
+    parser = Parser(NullListener())
+    parser.line_offset = 0
+    for event, args in events:
+        getattr(parser, event)(*args)
+
+def main():
+    recorder = EventRecorder()
+    UniversalLexer(recorder).scan(heavy_feature(FeatureBuilder(), 2000))
+    events = recorder.events
+    elapsed = timed('%d listener calls' % len(events),
+                    lambda: replay(events))
+    print '%-40s %8.0f/s' % ('', len(events) / elapsed)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Parses many small features with a new Parser for each, and with one
+Parser through Parser.parse_many.
+
+    cd python && python -m bench.parser_many
+"""
+
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, NullListener, timed
+
+def fresh_parsers(documents):
+    for source, uri in documents:
+        Parser(NullListener()).parse(source, uri, 0)
+
+def one_parser(documents):
+    parser = Parser(NullListener())
+    for uri, error in parser.parse_many(documents):
+        assert error is None
+
+def main():
+    builder = FeatureBuilder()
+    documents = [(builder.feature(scenarios=2, steps=3), 'f%d.feature' % i)
+                 for i in range(2000)]
+    timed('2000 features, a parser each', lambda: fresh_parsers(documents))
+    timed('2000 features, parse_many', lambda: one_parser(documents))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os.path
+import random
+import time
+
+here = os.path.dirname(__file__)
+fixtures = os.path.join(here, '..', '..', 'spec', 'gherkin', 'fixtures')
+
+WORDS = u'''lorem ipsum dolor sit amet consectetur adipisicing elit sed do
+eiusmod tempor incididunt ut labore et dolore magna aliqua enim ad minim
+veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo
+consequat'''.split()
+
+def fixture(filename):
+    return open(os.path.join(fixtures, filename)).read()
+
+class FeatureBuilder(object):
+    """Builds random but repeatable features, like tasks/bench/feature_builder.rb
+    does for the Ruby benchmarks."""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+
+    def words(self, count):
+        return u' '.join(self.random.choice(WORDS) for i in range(count))
+
+    def table(self, rows, cols, indent=u'      '):
+        lines = []
+        for i in range(rows):
+            cells = [self.words(self.random.randint(1, 2)) for j in range(cols)]
+            lines.append(indent + u'| ' + u' | '.join(cells) + u' |')
+        return lines
+
+    def feature(self, scenarios=10, steps=5, table_rows=0, table_cols=4,
+                doc_string_lines=0, description_lines=0):
+        lines = [u'Feature: ' + self.words(3)]
+        lines.extend(u'  ' + self.words(8) for i in range(description_lines))
+        for i in range(scenarios):
+            lines.append(u'')
+            lines.append(u'  @tag%d @smoke' % (i % 10))
+            lines.append(u'  Scenario: ' + self.words(4))
+            lines.extend(u'    ' + self.words(8)
+                         for j in range(description_lines))
+            for j in range(steps):
+                lines.append(u'    Given ' + self.words(6))
+            if table_rows:
+                lines.extend(self.table(table_rows, table_cols))
+            if doc_string_lines:
+                lines.append(u'      """')
+                lines.extend(u'      ' + self.words(10)
+                             for j in range(doc_string_lines))
+                lines.append(u'      """')
+        return u'\n'.join(lines) + u'\n'
+
+class NullListener(object):
+    def __getattr__(self, name):
+        return self.ignore
+
+    def ignore(self, *args):
+        pass
+
+def timed(name, function, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print '%-40s %8.4fs' % (name, best)
+    return best
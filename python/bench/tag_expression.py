@@ -0,0 +1,49 @@
+"""Evaluates tag expressions against the tags of 20k scenarios, with the
+former dict-building TagExpression.eval, with the compiled eval and with
+eval_many.
+
+    cd python && python -m bench.tag_expression
+"""
+
+import random
+
+from gherkin.tag_expression import TagExpression
+
+from bench.support import timed
+
+def dict_eval(expression, tags):
+    if not expression.ands:
+        return True
+
+    params = dict([(tag, True) for tag in tags])
+
+    def test_tag(tag):
+        if tag.startswith('~'):
+            return not params.get(tag[1:], False)
+        return params.get(tag, False)
+
+    for ors in expression.ands:
+        if not ors:
+            continue
+        if True not in [test_tag(tag) for tag in ors]:
+            return False
+    return True
+
+def main():
+    rng = random.Random(0)
+    tags = ['@tag%d' % i for i in range(50)] + ['@smoke', '@wip', '@slow']
+    tag_lists = [rng.sample(tags, rng.randint(0, 6)) for i in range(20000)]
+    expression = TagExpression(['@tag1,@tag2,@tag3,@smoke', '~@wip',
+                                '~@slow,~@tag4'])
+
+    expected = [dict_eval(expression, t) for t in tag_lists]
+    assert [expression.eval(t) for t in tag_lists] == expected
+    assert expression.eval_many(tag_lists) == expected
+    print '%d of %d selected' % (sum(expected), len(expected))
+
+    timed('dict eval', lambda: [dict_eval(expression, t) for t in tag_lists])
+    timed('compiled eval', lambda: [expression.eval(t) for t in tag_lists])
+    timed('eval_many', lambda: expression.eval_many(tag_lists))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Serializes the models of complex.feature style documents, scaled to
+thousands of scenarios, with JSONFormatter and with to_dict() alone.
+
+    cd python && python -m bench.to_dict
+"""
+
+from cStringIO import StringIO
+
+from gherkin.formatter import model
+from gherkin.formatter.json_formatter import JSONFormatter
+from gherkin.parser import Parser
+
+from bench.support import FeatureBuilder, fixture, timed
+
+class EventRecorder(object):
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.events.append((name, args))
+        return record
+
+def main():
+    builder = FeatureBuilder()
+    recorder = EventRecorder()
+    parser = Parser(recorder)
+    parser.parse(fixture('complex.feature'), 'complex.feature', 0)
+    for i in range(10):
+        feature = builder.feature(scenarios=200, table_rows=3,
+                                  doc_string_lines=2, description_lines=2)
+        parser.parse(feature, 'f%d.feature' % i, 0)
+    events = recorder.events
+    models = [args[0] for name, args in events
+              if args and isinstance(args[0], model.Dictable)]
+
+    def format_json():
+        formatter = JSONFormatter(StringIO())
+        for name, args in events:
+            getattr(formatter, name)(*args)
+
+    timed('JSONFormatter, 2000 scenarios', format_json)
+    timed('to_dict(), %d models' % len(models),
+          lambda: [m.to_dict() for m in models])
+    if hasattr(model, 'to_dicts'):
+        timed('to_dicts(), %d models' % len(models),
+              lambda: model.to_dicts(models))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Parses a corpus of feature files across a pool of processes."""
+
+import multiprocessing
+import os
+import os.path
+
+from gherkin.formatter.json_formatter import JSONFormatter
+from gherkin.parser import Parser
+
+class BatchFormatter(JSONFormatter):
+    """Keeps the JSON of each feature and its syntax errors, instead of
+    writing them to a file."""
+
+    def __init__(self):
+        JSONFormatter.__init__(self, None)
+        self.errors = []
+
+    def syntax_error(self, state, event, legal_events, uri, line):
+        self.errors.append({
+            'state': state,
+            'event': event,
+            'legal_events': legal_events,
+            'uri': uri,
+            'line': line,
+        })
+
+    def take(self, uri, error):
+        """The result of the document just parsed, then forgets it."""
+        errors = self.errors
+        if error is not None:
+            errors.append({'uri': uri, 'message': str(error)})
+        result = {
+            'uri': uri,
+            'feature': self._gherkin_object,
+            'errors': errors,
+        }
+        self._gherkin_object = None
+        self.errors = []
+        return result
+
+def documents(paths):
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield f.read(), path
+
+def parse_chunk(paths):
+    formatter = BatchFormatter()
+    parser = Parser(formatter, raise_on_error=False)
+    results = []
+    for path in paths:
+        # A file that can't be read is an error of its own, not of the chunk
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+        except (IOError, OSError), e:
+            results.append(formatter.take(path, e))
+            continue
+        for uri, error in parser.parse_many([(source, path)]):
+            results.append(formatter.take(uri, error))
+    return results
+
+def feature_paths(paths):
+    """The .feature files in paths, with directories searched in sorted
+    order."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.feature'):
+                    yield os.path.join(root, name)
+
+def parse_files(paths, processes=None, chunksize=16):
+    """Parses the feature files in paths, a list of files and directories,
+    in chunks of chunksize files on a pool of processes, by default one per
+    core. Yields a dict for each file in input order, with its 'uri', the
+    'feature' as JSONFormatter would write it and the syntax or lexing
+    'errors' it had."""
+    paths = list(feature_paths(paths))
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    if processes == 1:
+        for chunk in chunks:
+            for result in parse_chunk(chunk):
+                yield result
+        return
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        for results in pool.imap(parse_chunk, chunks):
+            for result in results:
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+def merge(results):
+    """Collects results into the list of features, as one JSON report, and
+    the list of errors."""
+    features = []
+    errors = []
+    for result in results:
+        if result['feature'] is not None:
+            features.append(result['feature'])
+        errors.extend(result['errors'])
+    return features, errors
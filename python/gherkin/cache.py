@@ -0,0 +1,219 @@
+"""An on-disk cache of what the parser tells a formatter about a source, so
+unchanged sources can be replayed to a formatter without lexing them."""
+
+import cPickle as pickle
+import errno
+import hashlib
+import os
+import os.path
+import tempfile
+
+from gherkin import __version__
+from gherkin.formatter.model import DescribedStatement, Step
+from gherkin.parser import ParseError
+
+here = os.path.dirname(__file__)
+
+# Bump when the recorded events change within a release
+FORMAT = '1'
+
+# The files the parser's output depends on, besides the source
+INPUTS = ('i18n_data.py', 'i18n.yml', 'parser_tables.py')
+
+def fingerprint():
+    digest = hashlib.sha1(FORMAT)
+    digest.update(__version__)
+    for name in INPUTS:
+        path = os.path.join(here, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(name)
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def source_bytes(source):
+    if isinstance(source, unicode):
+        return source.encode('utf8')
+    if isinstance(source, memoryview):
+        return source.tobytes()
+    return source
+
+def materialize(model):
+    # Lazy text still refers to the source, which isn't pickled
+    if isinstance(model, DescribedStatement):
+        model.description
+    elif isinstance(model, Step) and model.doc_string is not None:
+        model.doc_string.value
+
+def record_event(event):
+    def handler(self, model):
+        materialize(model)
+        self.events.append((event, model))
+        getattr(self.formatter, event)(model)
+    return handler
+
+class EventRecorder(object):
+    """Passes formatter calls on to formatter and records them."""
+
+    def __init__(self, formatter):
+        self.formatter = formatter
+        self.events = []
+        self.complete = False
+
+    feature = record_event('feature')
+    background = record_event('background')
+    scenario = record_event('scenario')
+    scenario_outline = record_event('scenario_outline')
+    examples = record_event('examples')
+    step = record_event('step')
+
+    def eof(self):
+        self.events.append(('eof', None))
+        self.formatter.eof()
+        self.complete = True
+
+    def syntax_error(self, state, event, legal_events, uri, line):
+        # The uri is left out, the same source may turn up at another one
+        self.events.append(('syntax_error', (state, event, legal_events,
+                                             line)))
+        self.formatter.syntax_error(state, event, legal_events, uri, line)
+
+def replay(events, formatter, uri, raise_on_error=False):
+    for event, args in events:
+        if event == 'eof':
+            formatter.eof()
+        elif event == 'syntax_error':
+            state, event, legal_events, line = args
+            if raise_on_error:
+                raise ParseError(state, event, legal_events, uri, line)
+            formatter.syntax_error(state, event, legal_events, uri, line)
+        else:
+            getattr(formatter, event)(args)
+
+class ParseCache(object):
+    """Parse results in the directory at path, keyed by the SHA-1 of the
+    source, the line offset, whether tables are columnar and the fingerprint
+    of the keywords and state machines. Parsers with an intern pool don't
+    use the cache. Entries are written to a temporary file and renamed into
+    place, so processes sharing the directory only ever read whole entries.
+    Reading an entry touches it, and once the entries take more than
+    max_size bytes the least recently used are removed. A cache only sees
+    what other processes put in the directory when it scans it, which it
+    does after writing a tenth of max_size, so N processes sharing the
+    directory keep it under about max_size * (1 + N / 10)."""
+
+    def __init__(self, path, max_size=256 * 1024 * 1024):
+        self.path = path
+        self.max_size = max_size
+        self.prefix = fingerprint()
+        # Bytes in the directory, from the last scan plus what was put since
+        self.size = None
+        self.written = 0
+        if not os.path.isdir(path):
+            try:
+                os.makedirs(path)
+            except OSError, e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+    def key(self, source, line_offset=0, columnar=False):
+        digest = hashlib.sha1(self.prefix)
+        digest.update('%d\0%d\0' % (line_offset, bool(columnar)))
+        digest.update(source_bytes(source))
+        return digest.hexdigest()
+
+    def entry(self, key):
+        return os.path.join(self.path, key + '.pickle')
+
+    def get(self, key):
+        path = self.entry(key)
+        try:
+            with open(path, 'rb') as f:
+                events = pickle.load(f)
+        except IOError, e:
+            if e.errno == errno.ENOENT:
+                return None
+            raise
+        except Exception:
+            # Truncated, or pickled from models that have changed since
+            self.remove(path)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            # Evicted by another process since
+            pass
+        return events
+
+    def put(self, key, events):
+        fd, temp = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(events, f, 2)
+            size = os.path.getsize(temp)
+            os.rename(temp, self.entry(key))
+        except:
+            self.remove(temp)
+            raise
+        self.written += size
+        if self.size is None or self.written > self.max_size * 0.1:
+            self.size = self.scan_size()
+            self.written = 0
+        else:
+            self.size += size
+        if self.size > self.max_size:
+            self.evict()
+
+    def parse(self, parser, source):
+        """Replays source from the cache to parser's formatter, or has parser
+        lex it and stores what the formatter was told."""
+        key = self.key(source, parser.line_offset, parser.columnar)
+        events = self.get(key)
+        if events is not None:
+            replay(events, parser.formatter, parser.feature_uri,
+                   parser.raise_on_error)
+            return
+        listener = parser.listener
+        recorder = listener.formatter = EventRecorder(parser.formatter)
+        try:
+            parser.lexer.scan(source)
+        finally:
+            listener.formatter = parser.formatter
+        if recorder.complete:
+            self.put(key, recorder.events)
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def scan_size(self):
+        return sum(size for mtime, size, path in self.entries())
+
+    def evict(self):
+        # Down to 90% of max_size, so every put doesn't scan the directory
+        entries = self.entries()
+        entries.sort()
+        size = sum(size for mtime, size, path in entries)
+        low_water = self.max_size * 0.9
+        for mtime, entry_size, path in entries:
+            if size <= low_water:
+                break
+            self.remove(path)
+            size -= entry_size
+        self.size = size
+        self.written = 0
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,129 @@
+"""Compiles the formatter events of a feature into pickles: flat, immutable
+scenarios ready to run, with the background steps in front, the tags of
+the feature, outline and examples merged and outlines expanded."""
+
+import collections
+
+from gherkin.outline import Outline
+from gherkin.parser import Parser
+
+Pickle = collections.namedtuple('Pickle', 'uri name lines tags steps')
+PickleStep = collections.namedtuple('PickleStep',
+                                    'keyword name lines rows doc_string')
+PickleString = collections.namedtuple('PickleString',
+                                      'content_type value line')
+
+def merge_tags(*tag_lists):
+    names = []
+    seen = set()
+    for tags in tag_lists:
+        for tag in tags:
+            if tag.name not in seen:
+                seen.add(tag.name)
+                names.append(tag.name)
+    return tuple(names)
+
+def pickle_step(step, lines):
+    rows = None
+    if step.rows:
+        rows = tuple(tuple(row.cells) for row in step.rows)
+    doc_string = None
+    if step.doc_string is not None:
+        doc_string = PickleString(step.doc_string.content_type,
+                                  step.doc_string.value, step.doc_string.line)
+    return PickleStep(step.keyword, step.name, lines, rows, doc_string)
+
+class Compiler(object):
+    """A formatter that calls emit with a Pickle for every scenario and
+    examples row of the features it is given. The background steps are
+    compiled once per feature and the same PickleSteps start every pickle
+    of the feature."""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.feature_uri = None
+        self.reset()
+
+    def reset(self):
+        self.feature_tags = ()
+        self.background_steps = ()
+        self.steps = None
+        self.element = None
+        self.outline_examples = []
+
+    def uri(self, uri):
+        self.feature_uri = uri
+
+    def feature(self, feature):
+        self.flush()
+        self.reset()
+        self.feature_tags = feature.tags
+
+    def background(self, background):
+        self.flush()
+        self.element = background
+        self.steps = []
+
+    def scenario(self, scenario):
+        self.flush()
+        self.element = scenario
+        self.steps = []
+
+    def scenario_outline(self, scenario_outline):
+        self.scenario(scenario_outline)
+
+    def step(self, step):
+        self.steps.append(step)
+
+    def examples(self, examples):
+        self.outline_examples.append(examples)
+
+    def eof(self):
+        self.flush()
+        self.reset()
+
+    def flush(self):
+        element = self.element
+        if element is None:
+            return
+        steps = self.steps
+        self.element = None
+        self.steps = None
+        if element.type == 'background':
+            self.background_steps = tuple(pickle_step(step, (step.line,))
+                                          for step in steps)
+        elif element.type == 'scenario':
+            self.emit(Pickle(
+                self.feature_uri, element.name, (element.line,),
+                merge_tags(self.feature_tags, element.tags),
+                self.background_steps + tuple(pickle_step(step, (step.line,))
+                                              for step in steps)))
+        else:
+            examples = self.outline_examples
+            self.outline_examples = []
+            self.emit_outline(element, steps, examples)
+
+    def emit_outline(self, outline, steps, examples):
+        emit = self.emit
+        uri = self.feature_uri
+        background_steps = self.background_steps
+        tags = None
+        last_examples = None
+        for examples, scenario, expanded in \
+                Outline(outline, steps, examples).scenarios():
+            if examples is not last_examples:
+                # The scenario tags are the outline's and the examples'
+                tags = merge_tags(self.feature_tags, scenario.tags)
+                last_examples = examples
+            row_line = scenario.line
+            emit(Pickle(
+                uri, scenario.name, (outline.line, row_line), tags,
+                background_steps + tuple(pickle_step(step,
+                                                     (step.line, row_line))
+                                         for step in expanded)))
+
+def pickles(source, uri, **options):
+    """The pickles of source, parsed with a Parser given options."""
+    compiled = []
+    Parser(Compiler(compiled.append), **options).parse(source, uri, 0)
+    return compiled
@@ -30,6 +30,7 @@ class FilterFormatter(object):
         self._examples_range = None
 
     def uri(self, uri):
+        self.filter.uri(uri)
         self.formatter.uri(uri)
     
     def feature(self, feature):
@@ -90,6 +91,8 @@ class FilterFormatter(object):
         self.formatter.eof()
     
     def detect_filters(self, filter_list):
+        if isinstance(filter_list, dict):
+            return filters.LineFilter(filter_list)
         filter_classes = set([type(f) for f in filter_list])
         if len(filter_classes) > 1 and filter_classes != set([str, unicode]):
             raise FilterError("Inconsistent filters: {0!r}".format(filter_list))
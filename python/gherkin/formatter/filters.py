@@ -1,18 +1,43 @@
+import bisect
+
 from gherkin.tag_expression import TagExpression
 
 class LineFilter(object):
+    """Matches the elements with any of lines in their range. lines is a
+    list of line numbers, or a dict of them by uri so that one filter
+    serves every file of a run; uri() picks the lines of the file being
+    filtered. The lines are kept sorted, for bisecting ranges, and in a
+    set, for table rows."""
+
     def __init__(self, lines):
-        self.lines = lines
-    
+        if isinstance(lines, dict):
+            self.lines_by_uri = dict((uri, self.index(uri_lines))
+                                     for uri, uri_lines in lines.items())
+            self.sorted_lines, self.lines = [], frozenset()
+        else:
+            self.lines_by_uri = None
+            self.sorted_lines, self.lines = self.index(lines)
+
+    def index(self, lines):
+        lines = frozenset(lines)
+        return sorted(lines), lines
+
+    def uri(self, uri):
+        if self.lines_by_uri is not None:
+            self.sorted_lines, self.lines = \
+                self.lines_by_uri.get(uri, ([], frozenset()))
+
     def eval(self, tags, names, ranges):
+        lines = self.sorted_lines
         for r in ranges:
-            for line in self.lines:
-                if r[0] <= line <= r[1]:
-                    return True
+            i = bisect.bisect_left(lines, r[0])
+            if i < len(lines) and lines[i] <= r[1]:
+                return True
         return False
     
     def filter_table_body_rows(self, rows):
-        body = [r for r in rows[1:] if r.line in self.lines]
+        lines = self.lines
+        body = [r for r in rows[1:] if r.line in lines]
         return [rows[0]] + body
 
 class RegexpFilter(object):
@@ -26,6 +51,9 @@ class RegexpFilter(object):
                     return True
         return False
     
+    def uri(self, uri):
+        pass
+    
     def filter_table_body_rows(self, rows):
         return rows
 
@@ -34,7 +62,10 @@ class TagFilter(object):
         self.tag_expression = TagExpression(tags)
     
     def eval(self, tags, names, ranges):
-        return self.tag_expression.eval([tag.name for tag in set(tags)])
+        return self.tag_expression.eval(tag.name for tag in tags)
+    
+    def uri(self, uri):
+        pass
     
     def filter_table_body_rows(self, rows):
         return rows
@@ -1,3 +1,7 @@
+from array import array
+
+from gherkin.lexer.views import SourceView
+
 def ensure_unicode(value):
     if value is None:
         return None
@@ -5,34 +9,129 @@ def ensure_unicode(value):
         value = value.decode('utf8')
     return value
 
+def ensure_text(value):
+    """Like ensure_unicode, but leaves lazy source views to be materialized
+    when they are first read."""
+    if isinstance(value, SourceView):
+        return value
+    return ensure_unicode(value)
+
+def lazy_text(name):
+    """A property for text that may be held as a SourceView in _<name>."""
+    attr = '_' + name
+
+    def get(self):
+        value = getattr(self, attr)
+        if isinstance(value, SourceView):
+            value = value.text()
+            setattr(self, attr, value)
+        return value
+
+    def set(self, value):
+        setattr(self, attr, ensure_text(value))
+
+    return property(get, set)
+
 class Argument(object):
+    __slots__ = ('offset', 'val')
+
     def __init__(self, offset, val):
         self.offset = offset
         self.val = ensure_unicode(val)
 
+    # Pickle protocols 0 and 1 need these for classes with __slots__
+    def __getstate__(self):
+        return (self.offset, self.val)
+
+    def __setstate__(self, state):
+        self.offset, self.val = state
+
+# The fields of each Dictable class, from its slots and those of its bases
+class_fields = {}
+
+# How to_dict() serializes the fields that aren't copied as they are, unless
+# they're None: lists of models, a model, and lists that are copied
+MODEL_LIST_FIELDS = frozenset(['comments', 'tags', 'rows'])
+MODEL_FIELDS = frozenset(['doc_string'])
+LIST_FIELDS = frozenset(['cells', 'arguments'])
+
+# The generated to_dict() of each Dictable class
+serializers = {}
+
+def serializer(cls):
+    """Generates the to_dict() of cls from its fields, once."""
+    lines = ['def to_dict(self):', '    result = {}']
+    if cls.include_type:
+        lines.append('    result["type"] = %r' % (cls.type,))
+    for field in cls.fields():
+        name = field.lstrip('_')
+        lines.append('    value = self.%s' % name)
+        if field in MODEL_LIST_FIELDS:
+            lines.append('    if value:')
+            lines.append('        result[%r] = [item.to_dict() for item in '
+                         'value]' % name)
+        elif field in MODEL_FIELDS:
+            lines.append('    if value is not None:')
+            lines.append('        result[%r] = value.to_dict()' % name)
+        elif field in LIST_FIELDS:
+            lines.append('    if value:')
+            lines.append('        result[%r] = list(value)' % name)
+        else:
+            lines.append('    if value is not None:')
+            lines.append('        result[%r] = value' % name)
+    lines.append('    return result')
+    namespace = {}
+    exec '\n'.join(lines) in namespace
+    to_dict = serializers[cls] = namespace['to_dict']
+    return to_dict
+
+def to_dicts(models):
+    """The to_dict() of each of models."""
+    results = []
+    append = results.append
+    for model in models:
+        to_dict = serializers.get(type(model))
+        if to_dict is None:
+            to_dict = serializer(type(model))
+        append(to_dict(model))
+    return results
+
 class Dictable(object):
+    __slots__ = ()
     include_type = False
-    
+
+    @classmethod
+    def fields(cls):
+        fields = class_fields.get(cls)
+        if fields is None:
+            fields = []
+            for klass in reversed(cls.__mro__):
+                fields.extend(klass.__dict__.get('__slots__', ()))
+            fields = class_fields[cls] = tuple(fields)
+        return fields
+
     def to_dict(self):
-        result = {}
-        if self.include_type:
-            result['type'] = self.type
-        for name, value in self.__dict__.items():
-            if isinstance(value, BasicStatement):
-                value = value.to_dict()
-            if type(value) is list:
-                new_value = []
-                for element in value:
-                    if isinstance(element, BasicStatement):
-                        new_value.append(element.to_dict())
-                    else:
-                        new_value.append(element)
-                value = new_value
-            if value not in ([], None):
-                result[name] = value
-        return result
-    
+        to_dict = serializers.get(type(self))
+        if to_dict is None:
+            to_dict = serializer(type(self))
+        return to_dict(self)
+
+    # Pickle protocols 0 and 1 need these for classes with __slots__. Lazy
+    # text is materialized rather than pickled with its source.
+    def __getstate__(self):
+        state = {}
+        for field in self.fields():
+            if hasattr(self, field):
+                state[field] = getattr(self, field.lstrip('_'))
+        return state
+
+    def __setstate__(self, state):
+        for field, value in state.iteritems():
+            setattr(self, field, value)
+
 class BasicStatement(Dictable):
+    __slots__ = ('comments', 'keyword', 'name', 'line')
+
     def __init__(self, comments, keyword, name, line):
         self.comments = comments
         self.keyword = ensure_unicode(keyword)
@@ -50,11 +149,16 @@ class BasicStatement(Dictable):
         return self.line
     
 class DescribedStatement(BasicStatement):
+    __slots__ = ('_description',)
+    description = lazy_text('description')
+
     def __init__(self, comments, keyword, name, description, line):
         super(DescribedStatement, self).__init__(comments, keyword, name, line)
-        self.description = ensure_unicode(description)
+        self.description = description
 
 class TagStatement(DescribedStatement):
+    __slots__ = ('tags',)
+
     def __init__(self, comments, tags, keyword, name, description, line):
         super(TagStatement, self).__init__(comments, keyword, name, description,
                                            line)
@@ -66,27 +170,33 @@ class TagStatement(DescribedStatement):
         return self.line
 
 class Replayable(object):
+    __slots__ = ()
     type = None
 
     def replay(self, formatter):
         getattr(formatter, self.type)(self)
 
 class Feature(TagStatement, Replayable):
+    __slots__ = ()
     type = "feature"
 
 class Background(DescribedStatement, Replayable):
+    __slots__ = ()
     type = "background"
     include_type = True
 
 class Scenario(TagStatement, Replayable):
+    __slots__ = ()
     type = "scenario"
     include_type = True
 
 class ScenarioOutline(TagStatement, Replayable):
+    __slots__ = ()
     type = "scenario_outline"
     include_type = True
 
 class Examples(TagStatement, Replayable):
+    __slots__ = ('rows',)
     type = "examples"
 
     def __init__(self, comments, tags, keyword, name, description, line, rows):
@@ -95,6 +205,7 @@ class Examples(TagStatement, Replayable):
         self.rows = rows
 
 class Step(BasicStatement, Replayable):
+    __slots__ = ('rows', 'doc_string')
     type = "step"
 
     def __init__(self, comments, keyword, name, line):
@@ -123,11 +234,15 @@ class Step(BasicStatement, Replayable):
         return arguments
 
 class Comment(Dictable):
+    __slots__ = ('value', 'line')
+
     def __init__(self, value, line):
         self.value = ensure_unicode(value)
         self.line = line
 
 class Tag(Dictable):
+    __slots__ = ('name', 'line')
+
     def __init__(self, name, line):
         self.name = ensure_unicode(name)
         self.line = line
@@ -139,9 +254,12 @@ class Tag(Dictable):
         return hash(self.name)
 
 class DocString(Dictable):
+    __slots__ = ('content_type', '_value', 'line')
+    value = lazy_text('value')
+
     def __init__(self, content_type, value, line):
         self.content_type = ensure_unicode(content_type)
-        self.value = ensure_unicode(value)
+        self.value = value
         self.line = line
 
     def line_range(self):
@@ -149,12 +267,107 @@ class DocString(Dictable):
         return (self.line, self.line + line_count + 1)
 
 class Row(Dictable):
+    __slots__ = ('comments', 'cells', 'line')
+
     def __init__(self, comments, cells, line):
         self.comments = comments
         self.cells = [ensure_unicode(c) for c in cells]
         self.line = line
 
+class DataTable(object):
+    """The rows of a table held by column: a tuple of the cells of each
+    column, header first, with equal cells shared through pool, and the
+    line of each row in an array. It reads as the list of Rows it was made
+    from, building each Row when it is read."""
+
+    __slots__ = ('columns', 'lines', 'comments')
+
+    def __init__(self, columns, lines, comments=None):
+        self.columns = columns
+        self.lines = lines
+        # The comments of the rows that have any, by row index
+        self.comments = comments
+
+    @classmethod
+    def from_rows(cls, rows, pool=None):
+        """Raises ValueError for rows with different numbers of cells."""
+        if not rows:
+            raise ValueError('A table needs a header')
+        width = len(rows[0].cells)
+        if pool is None:
+            pool = {}
+        intern = pool.setdefault
+        columns = [[] for i in range(width)]
+        comments = None
+        for i, row in enumerate(rows):
+            if len(row.cells) != width:
+                raise ValueError('Row %d has %d cells, the header %d' %
+                                 (i, len(row.cells), width))
+            for column, cell in zip(columns, row.cells):
+                column.append(intern(cell, cell))
+            if row.comments:
+                if comments is None:
+                    comments = {}
+                comments[i] = row.comments
+        lines = array('l', [row.line for row in rows])
+        return cls(tuple(tuple(column) for column in columns), lines,
+                   comments)
+
+    @property
+    def header(self):
+        return [column[0] for column in self.columns]
+
+    def row(self, index):
+        return [column[index] for column in self.columns]
+
+    def column(self, key):
+        """The cells under the header key, or in column number key, without
+        the header."""
+        if not isinstance(key, (int, long)):
+            key = self.header.index(key)
+        return list(self.columns[key][1:])
+
+    def hashes(self):
+        """A dict of each row but the header, from header to cell."""
+        header = self.header
+        body = zip(*[column[1:] for column in self.columns])
+        return [dict(zip(header, cells)) for cells in body]
+
+    def to_numpy(self):
+        """The cells without the header, as a 2-d array of objects. Needs
+        NumPy."""
+        import numpy
+        body = numpy.empty((len(self.lines) - 1, len(self.columns)),
+                           dtype=object)
+        for i, column in enumerate(self.columns):
+            body[:, i] = column[1:]
+        return body
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        comments = []
+        if self.comments is not None:
+            comments = self.comments.get(index, comments)
+        return Row(comments, self.row(index), self.lines[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getstate__(self):
+        return (self.columns, self.lines, self.comments)
+
+    def __setstate__(self, state):
+        self.columns, self.lines, self.comments = state
+
 class Match(Dictable, Replayable):
+    __slots__ = ('arguments', 'location')
     type = "match"
 
     def __init__(self, arguments, location):
@@ -162,9 +375,14 @@ class Match(Dictable, Replayable):
         self.location = location
 
 class Result(Dictable, Replayable):
+    __slots__ = ('status', 'duration', 'error_message')
     type = "result"
 
     def __init__(self, status, duration, error_message):
         self.status = ensure_unicode(status)
         self.duration = duration
         self.error_message = ensure_unicode(error_message)
+
+for cls in (Feature, Background, Scenario, ScenarioOutline, Examples, Step,
+            Comment, Tag, DocString, Row, Match, Result):
+    serializer(cls)
@@ -1,10 +1,12 @@
 # -*- coding: utf8 -*-
 
+import collections
 import cStringIO
+import importlib
+import marshal
 import os.path
 import re
-
-import yaml
+import warnings
 
 from gherkin.formatter import model, pretty_formatter
 from gherkin.lexer import ext as ext_lexer
@@ -18,8 +20,59 @@ real_keyword_re = re.compile(r"< $")
 def construct_yaml_str(self, node):
     return self.construct_scalar(node)
 
-yaml.Loader.add_constructor(u'tag:yaml.org,2002:str', construct_yaml_str)
-yaml.SafeLoader.add_constructor(u'tag:yaml.org,2002:str', construct_yaml_str)
+def read_yaml(path):
+    # PyYAML takes a while to import, it's only needed without i18n_data
+    import yaml
+    yaml.SafeLoader.add_constructor(u'tag:yaml.org,2002:str',
+                                    construct_yaml_str)
+    with open(path) as f:
+        return yaml.load(f, Loader=yaml.SafeLoader)
+
+def compile_languages(source=os.path.join(here, 'i18n.yml'),
+                      target=os.path.join(here, 'i18n_data.py')):
+    """Writes the languages in i18n.yml to a module that Languages loads
+    instead of the YAML, with the keywords of each language marshalled."""
+    languages = read_yaml(source)
+    with open(target, 'w') as f:
+        f.write('# Generated from i18n.yml by gherkin.i18n.compile_languages'
+                '(), do not edit.\n\nLANGUAGES = {\n')
+        for iso_code in sorted(languages):
+            f.write('    %r: %r,\n' % (str(iso_code),
+                                       marshal.dumps(languages[iso_code])))
+        f.write('}\n')
+
+class Languages(collections.Mapping):
+    """The keywords of each language by iso code. They come from the
+    generated module, where a language is only unmarshalled when it's first
+    used, or from i18n.yml when the module hasn't been generated."""
+
+    def __init__(self, path, module='gherkin.i18n_data'):
+        self.path = path
+        self.module = module
+        self.compiled = None
+        self.loaded = {}
+
+    def load(self):
+        if self.compiled is None:
+            try:
+                self.compiled = importlib.import_module(self.module).LANGUAGES
+            except ImportError:
+                self.loaded = read_yaml(self.path)
+                self.compiled = dict.fromkeys(self.loaded)
+        return self.compiled
+
+    def __getitem__(self, iso_code):
+        compiled = self.load()[iso_code]
+        keywords = self.loaded.get(iso_code)
+        if keywords is None:
+            keywords = self.loaded[iso_code] = marshal.loads(compiled)
+        return keywords
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
 
 def quote(value):
     return u'"' + value + u'"'
@@ -40,15 +93,20 @@ class I18n(object):
         'but',
     ]
     KEYWORD_KEYS = FEATURE_ELEMENT_KEYS + STEP_KEYWORD_KEYS
-    LANGUAGES = yaml.load(open(os.path.join(here, 'i18n.yml')))
+    LANGUAGES = Languages(os.path.join(here, 'i18n.yml'))
 
     languages = {}
+    # Lookups across every language, computed once and shared
+    shared_memo = {}
 
     @classmethod
     def all(cls):
-        codes = cls.LANGUAGES.keys()
-        codes.sort()
-        return [cls.get(iso_code) for iso_code in codes]
+        languages = cls.shared_memo.get('all')
+        if languages is None:
+            codes = sorted(cls.LANGUAGES.keys())
+            languages = cls.shared_memo['all'] = \
+                tuple(cls.get(iso_code) for iso_code in codes)
+        return languages
 
     @classmethod
     def get(cls, iso_code):
@@ -59,7 +117,14 @@ class I18n(object):
         return i18n
 
     @classmethod
-    def keyword_regexp(cls, *keywords):
+    def unique_keywords(cls, *keywords):
+        """The keywords of every language for each key, or 'step', longest
+        first where one starts another."""
+        memo_key = ('unique_keywords',) + tuple(str(k) for k in keywords)
+        unique_keywords = cls.shared_memo.get(memo_key)
+        if unique_keywords is not None:
+            return unique_keywords
+
         unique_keywords = set()
         for i18n in cls.all():
             for keyword in keywords:
@@ -70,13 +135,55 @@ class I18n(object):
 
         unique_keywords = [unicode(k) for k in unique_keywords]
         unique_keywords.sort(reverse=True)
-        return '|'.join(unique_keywords)
+        unique_keywords = cls.shared_memo[memo_key] = tuple(unique_keywords)
+        return unique_keywords
+
+    @classmethod
+    def keyword_regexp(cls, *keywords):
+        memo_key = ('keyword_regexp',) + tuple(str(k) for k in keywords)
+        regexp = cls.shared_memo.get(memo_key)
+        if regexp is None:
+            regexp = cls.shared_memo[memo_key] = \
+                '|'.join(cls.unique_keywords(*keywords))
+        return regexp
+
+    @classmethod
+    def keyword_pattern(cls, *keywords):
+        """A compiled regexp matching any of the keywords."""
+        memo_key = ('keyword_pattern',) + tuple(str(k) for k in keywords)
+        pattern = cls.shared_memo.get(memo_key)
+        if pattern is None:
+            escaped = [re.escape(k) for k in cls.unique_keywords(*keywords)]
+            pattern = cls.shared_memo[memo_key] = \
+                re.compile('|'.join(escaped), re.UNICODE)
+        return pattern
+
+    @classmethod
+    def keyword_index(cls):
+        """Maps every keyword to the (iso_code, key) pairs it is a keyword
+        for. The dict is shared, don't change it."""
+        index = cls.shared_memo.get('keyword_index')
+        if index is None:
+            index = {}
+            for i18n in cls.all():
+                for key in cls.KEYWORD_KEYS:
+                    for keyword in i18n.keywords(key):
+                        index.setdefault(keyword, []).append(
+                            (i18n.iso_code, key))
+            for keyword, uses in index.items():
+                index[keyword] = tuple(uses)
+            cls.shared_memo['keyword_index'] = index
+        return index
 
     @classmethod
     def all_code_keywords(cls):
-        keywords = set(sum([i18n.code_keywords() for i18n in cls.all()], []))
-        keywords = list(keywords)
-        keywords.sort()
+        keywords = cls.shared_memo.get('all_code_keywords')
+        if keywords is None:
+            keywords = set()
+            for i18n in cls.all():
+                keywords.update(i18n.code_keywords())
+            keywords = cls.shared_memo['all_code_keywords'] = \
+                tuple(sorted(keywords))
         return keywords
 
     @classmethod
@@ -115,24 +222,45 @@ class I18n(object):
             whitespace_re.sub('', self._keywords['name'])
         self.underscored_iso_code = \
             underscore_re.sub('_', self.iso_code).lower()
+        # The keyword lookups of this language
+        self.keyword_memo = {}
 
-    def lexer(self, listener):
-        return ext_lexer.get_lexer(self.underscored_iso_code, listener)
+    def lexer(self, listener, force_universal=False, **options):
+        # The C lexers take no options, lazy_text needs the universal lexer
+        if not force_universal and not options:
+            try:
+                return ext_lexer.get_lexer(self.underscored_iso_code, listener)
+            except ImportError, e:
+                warnings.warn('%s. Reverting to the universal lexer.' % e)
+        # Imported here, the universal lexer builds on this module
+        from gherkin.lexer.universal import UniversalLexer
+        return UniversalLexer(listener, self.iso_code, **options)
 
     def step_keywords(self):
-        keywords = set()
-        for iso_code in self.STEP_KEYWORD_KEYS:
-            keywords.update(self.keywords(iso_code))
-        return list(keywords)
+        keywords = self.keyword_memo.get(('step_keywords',))
+        if keywords is None:
+            keywords = set()
+            for iso_code in self.STEP_KEYWORD_KEYS:
+                keywords.update(self.keywords(iso_code))
+            keywords = self.keyword_memo[('step_keywords',)] = tuple(keywords)
+        return keywords
 
     def code_keywords(self):
-        keywords = [self.code_keyword_for(k) for k in self.step_keywords()]
-        return [k for k in keywords if k != '*']
+        keywords = self.keyword_memo.get(('code_keywords',))
+        if keywords is None:
+            keywords = [self.code_keyword_for(k) for k in self.step_keywords()]
+            keywords = self.keyword_memo[('code_keywords',)] = \
+                tuple(k for k in keywords if k != '*')
+        return keywords
 
     def keywords(self, key):
         key = str(key)
-        keywords = self._keywords[key].split('|')
-        return [self.real_keyword(key, keyword) for keyword in keywords]
+        keywords = self.keyword_memo.get(('keywords', key))
+        if keywords is None:
+            keywords = self._keywords[key].split('|')
+            keywords = self.keyword_memo[('keywords', key)] = \
+                tuple(self.real_keyword(key, keyword) for keyword in keywords)
+        return keywords
 
     def keyword_table(self):
         stream = cStringIO.StringIO()
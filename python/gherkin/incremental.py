@@ -0,0 +1,217 @@
+"""Reparses a feature as it is edited, lexing only the top-level elements
+an edit touches."""
+
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.parser import Parser, ParseError
+
+def shift_lines(model, delta):
+    model.line += delta
+    for comment in model.comments:
+        comment.line += delta
+    for tag in getattr(model, 'tags', ()):
+        tag.line += delta
+    for row in getattr(model, 'rows', None) or ():
+        row.line += delta
+        for comment in row.comments:
+            comment.line += delta
+    doc_string = getattr(model, 'doc_string', None)
+    if doc_string is not None:
+        doc_string.line += delta
+
+class Element(object):
+    """A feature header, background, scenario or scenario outline: the line
+    it starts on, its comments and tags included, and the formatter events
+    of its models. Line numbers of the models catch up with start when the
+    events are read."""
+
+    def __init__(self, start):
+        self.start = start
+        self.behind = 0
+        self._events = []
+
+    @property
+    def type(self):
+        return self._events[0][0]
+
+    def is_open(self):
+        """Whether the next element may change with this one: it has no
+        steps, so its description may take in the next heading, or it ends
+        with a doc string, whose following comments and rows go to the next
+        element."""
+        event, model = self._events[-1]
+        if event == 'step':
+            return model.doc_string is not None
+        return len(self._events) == 1 and event != 'feature'
+
+    @property
+    def events(self):
+        if self.behind:
+            for event, model in self._events:
+                shift_lines(model, self.behind)
+            self.behind = 0
+        return self._events
+
+    def move(self, delta):
+        self.start += delta
+        self.behind += delta
+
+def collect_element(event):
+    def handler(self, model):
+        element = Element(model.line_range()[0])
+        element.events.append((event, model))
+        self.elements.append(element)
+    return handler
+
+def collect_event(event):
+    def handler(self, model):
+        if not self.elements:
+            raise ParseError('Fragment starts in an element')
+        self.elements[-1].events.append((event, model))
+    return handler
+
+class ElementCollector(object):
+    def __init__(self):
+        self.elements = []
+
+    def uri(self, uri):
+        pass
+
+    feature = collect_element('feature')
+    background = collect_element('background')
+    scenario = collect_element('scenario')
+    scenario_outline = collect_element('scenario_outline')
+    examples = collect_event('examples')
+    step = collect_event('step')
+
+    def eof(self):
+        pass
+
+class Document(object):
+    """A parsed feature. edit() replaces lines of its source and reparses
+    the elements that contain them, and the elements next to them that
+    they may change, falling back to parsing the whole source when they
+    don't parse on their own, or the language comment changes. Lines of later elements are moved as they are, so the work
+    follows the size of the edited elements rather than of the feature."""
+
+    def __init__(self, source, uri=None, force_universal=False):
+        self.uri = uri
+        self.force_universal = force_universal
+        self.lines = source.split(u'\n')
+        self.elements = None
+        self.i18n_language = None
+        self.parse()
+
+    @property
+    def source(self):
+        return u'\n'.join(self.lines)
+
+    def parse(self):
+        self.elements = None
+        collector = ElementCollector()
+        parser = Parser(collector, force_universal=self.force_universal)
+        parser.parse(self.source, self.uri, 0)
+        if collector.elements:
+            collector.elements[0].start = 1
+        self.elements = collector.elements
+        self.i18n_language = parser.lexer.i18n_language
+
+    def edit(self, first, last, text):
+        """Replaces lines first to last, counted from 1, with the lines of
+        text. A last of first - 1 inserts text before line first."""
+        new_lines = text.split(u'\n')
+        delta = len(new_lines) - (last - first + 1)
+        elements = self.elements
+        self.lines[first - 1:last] = new_lines
+        if not elements:
+            self.parse()
+            return
+
+        i = self.index(first)
+        j = self.index(max(first, last))
+        # An open element is reparsed with the next one
+        while i > 0 and elements[i - 1].is_open():
+            i -= 1
+        start = elements[i].start
+        while True:
+            if j + 1 < len(elements):
+                end = elements[j + 1].start - 1 + delta
+            else:
+                end = len(self.lines)
+            fragment = u'\n'.join(self.lines[start - 1:end])
+
+            try:
+                parsed = self.parse_fragment(fragment, start, i == 0)
+            except (ParseError, LexingError):
+                parsed = None
+            if parsed is None:
+                self.parse()
+                return
+            reparsed, open_end = parsed
+            if not (open_end or elements[j].is_open()) or \
+                    j + 1 == len(elements):
+                break
+            # The next element takes what the fragment ends with, or took
+            # what the edited element ended with
+            j += 1
+
+        # The fragment is parsed as if it followed the header, but only the
+        # element after the header may be a background
+        following = elements[j + 1:j + 2]
+        for k, element in enumerate(reparsed + following):
+            if element.type == 'background' and i + k != 1:
+                self.parse()
+                return
+
+        if delta:
+            for element in elements[j + 1:]:
+                element.move(delta)
+        elements[i:j + 1] = reparsed
+
+    def parse_fragment(self, fragment, start, header):
+        """The elements of fragment, and whether it ends with comments or
+        tags of the next element, or an open element. None when the language
+        changed."""
+        if header:
+            if I18nLexer(None).lang(fragment) is not self.i18n_language:
+                return None
+            state = 'root'
+        else:
+            state = 'feature'
+        collector = ElementCollector()
+        parser = Parser(collector)
+        parser.force_state(state)
+        parser.line_offset = start - 1
+        lexer = self.i18n_language.lexer(parser, self.force_universal)
+        lexer.scan(fragment)
+
+        elements = collector.elements
+        if header and (not elements or elements[0].events[0][0] != 'feature'):
+            return None
+        listener = parser.listener
+        open_end = bool(listener.comments or listener.tags or
+                        elements and elements[-1].is_open())
+        if header:
+            elements[0].start = 1
+        for element in elements:
+            element.move(start - 1)
+        return elements, open_end
+
+    def index(self, line):
+        # The element that line is in
+        elements = self.elements
+        low, high = 0, len(elements)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if elements[middle].start <= line:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def replay(self, formatter):
+        formatter.uri(self.uri)
+        for element in self.elements:
+            for event, model in element.events:
+                getattr(formatter, event)(model)
+        formatter.eof()
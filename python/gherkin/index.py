@@ -0,0 +1,239 @@
+"""An SQLite index of the feature elements in a corpus of feature files, to
+find the elements that match tags, lines or names without parsing."""
+
+import collections
+import os
+import re
+import sqlite3
+
+from gherkin.batch import documents, feature_paths
+from gherkin.parser import Parser
+from gherkin.tag_expression import TagExpression
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    uri TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS elements (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    feature_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    first_line INTEGER NOT NULL,
+    last_line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS elements_lines
+    ON elements (file_id, first_line);
+CREATE TABLE IF NOT EXISTS tags (
+    element_id INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_name ON tags (name, element_id);
+CREATE INDEX IF NOT EXISTS tags_element ON tags (element_id);
+'''
+
+ELEMENT_COLUMNS = '''
+    SELECT files.uri, elements.type, elements.feature_name, elements.name,
+           elements.first_line, elements.last_line
+    FROM elements JOIN files ON files.id = elements.file_id
+'''
+
+Element = collections.namedtuple('Element', 'uri type feature_name name '
+                                 'first_line last_line')
+
+class ElementRecorder(object):
+    """Collects the feature elements of a document, with their line ranges
+    and effective tags worked out like FilterFormatter does."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.elements = []
+        self.feature_name = u''
+        self.feature_tags = []
+        self.outline_tags = []
+        self.current = None
+
+    def uri(self, uri):
+        pass
+
+    def feature(self, feature):
+        self.feature_name = feature.name
+        self.feature_tags = [tag.name for tag in feature.tags]
+
+    def background(self, background):
+        self.add('background', background, [])
+
+    def scenario(self, scenario):
+        self.add('scenario', scenario, scenario.tags)
+
+    def scenario_outline(self, scenario_outline):
+        self.add('scenario_outline', scenario_outline, scenario_outline.tags)
+        self.outline_tags = [tag.name for tag in scenario_outline.tags]
+
+    def examples(self, examples):
+        last_line = examples.line_range()[1]
+        if examples.rows:
+            last_line = examples.rows[-1].line
+        tags = self.feature_tags + self.outline_tags + \
+            [tag.name for tag in examples.tags]
+        self.elements.append(['examples', examples.name,
+                              examples.line_range()[0], last_line, tags])
+
+    def add(self, type, element, tags):
+        tags = self.feature_tags + [tag.name for tag in tags]
+        self.current = [type, element.name, element.line_range()[0],
+                        element.line, tags]
+        self.elements.append(self.current)
+
+    def step(self, step):
+        self.current[3] = step.line_range()[1]
+
+    def eof(self):
+        pass
+
+def file_uri(path):
+    """The absolute, normalized path of a file as the unicode uri the
+    index stores it under."""
+    path = os.path.abspath(path)
+    return path.decode('utf8') if isinstance(path, str) else path
+
+def regexp(pattern, value):
+    return re.search(pattern, value) is not None
+
+class Index(object):
+    """The feature elements of the files last passed to update(), stored in
+    the SQLite database at path. Each element is a background, scenario,
+    scenario outline or examples, with its line range and the tags that
+    apply to it."""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.create_function('regexp', 2, regexp)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self, paths):
+        """Indexes the .feature files in paths, a list of files and
+        directories, parsing only those whose mtime or size changed, and
+        drops the files that are gone. Files are stored by absolute path, so
+        a file found twice, or from another working directory, is indexed
+        once. Returns (uri, error) for each file that
+        failed to parse; it is indexed without elements."""
+        db = self.db
+        known = dict((_uri, (file_id, mtime, size))
+                     for file_id, _uri, mtime, size in
+                     db.execute('SELECT id, uri, mtime, size FROM files'))
+        files = {}
+        changed = []
+        for path in feature_paths(paths):
+            path = os.path.abspath(path)
+            if path in files:
+                continue
+            stat = os.stat(path)
+            uri = file_uri(path)
+            files[path] = (uri, stat.st_mtime, stat.st_size)
+            if known.get(uri, (None,))[1:] != files[path][1:]:
+                changed.append(path)
+
+        with db:
+            uris = set(_uri for _uri, mtime, size in files.values())
+            gone = [(file_id,)
+                    for _uri, (file_id, mtime, size) in known.items()
+                    if _uri not in uris]
+            gone += [(known[files[path][0]][0],) for path in changed
+                     if files[path][0] in known]
+            db.executemany('DELETE FROM tags WHERE element_id IN '
+                           '(SELECT id FROM elements WHERE file_id = ?)', gone)
+            db.executemany('DELETE FROM elements WHERE file_id = ?', gone)
+            db.executemany('DELETE FROM files WHERE id = ?', gone)
+
+            errors = []
+            recorder = ElementRecorder()
+            parser = Parser(recorder)
+            for path, error in parser.parse_many(documents(changed)):
+                uri, mtime, size = files[path]
+                file_id = db.execute(
+                    'INSERT INTO files (uri, mtime, size) VALUES (?, ?, ?)',
+                    (uri, mtime, size)).lastrowid
+                if error is None:
+                    self.insert(file_id, recorder)
+                else:
+                    errors.append((uri, error))
+                recorder.reset()
+        return errors
+
+    def insert(self, file_id, recorder):
+        for type, name, first_line, last_line, tags in recorder.elements:
+            element_id = self.db.execute(
+                'INSERT INTO elements (file_id, type, feature_name, name, '
+                'first_line, last_line) VALUES (?, ?, ?, ?, ?, ?)',
+                (file_id, type, recorder.feature_name, name, first_line,
+                 last_line)).lastrowid
+            self.db.executemany(
+                'INSERT INTO tags (element_id, name) VALUES (?, ?)',
+                [(element_id, tag) for tag in set(tags)])
+
+    def select(self, where, params):
+        query = ELEMENT_COLUMNS + ' WHERE ' + where + \
+            ' ORDER BY files.uri, elements.first_line'
+        return [Element(*row) for row in self.db.execute(query, params)]
+
+    def tagged(self, tag_expressions):
+        """The elements whose tags match tag_expressions, as TagFilter and
+        TagExpression would match them."""
+        conditions = []
+        params = []
+        for ors in TagExpression(tag_expressions).ands:
+            if not ors:
+                continue
+            marks = ', '.join('?' * len(ors))
+            if ors[0].startswith('~'):
+                # Fails only for elements with every one of the tags
+                conditions.append(
+                    '(SELECT COUNT(DISTINCT name) FROM tags WHERE '
+                    'element_id = elements.id AND name IN (%s)) < ?' % marks)
+                params.extend(tag[1:] for tag in ors)
+                params.append(len(set(ors)))
+            else:
+                conditions.append('elements.id IN (SELECT element_id FROM '
+                                  'tags WHERE name IN (%s))' % marks)
+                params.extend(ors)
+        return self.select(' AND '.join(conditions) or '1', params)
+
+    def lines(self, uri, lines):
+        """The elements of the file at uri, a path relative to the working
+        directory or absolute, whose line range contains any of lines."""
+        # The lines go in a table, there may be more than SQLite takes
+        # parameters
+        db = self.db
+        db.execute('CREATE TEMP TABLE IF NOT EXISTS wanted_lines '
+                   '(line INTEGER PRIMARY KEY)')
+        with db:
+            db.execute('DELETE FROM wanted_lines')
+            db.executemany('INSERT OR IGNORE INTO wanted_lines (line) '
+                           'VALUES (?)', [(line,) for line in lines])
+        return self.select('files.uri = ? AND EXISTS (SELECT 1 FROM '
+                           'wanted_lines WHERE line BETWEEN '
+                           'elements.first_line AND elements.last_line)',
+                           [file_uri(uri)])
+
+    def named(self, patterns):
+        """The elements whose name, or the name of their feature, matches
+        any of the regular expression patterns."""
+        conditions = []
+        params = []
+        for pattern in patterns:
+            if hasattr(pattern, 'pattern'):
+                pattern = pattern.pattern
+            conditions.append('elements.feature_name REGEXP ? OR '
+                              'elements.name REGEXP ?')
+            params.extend([pattern, pattern])
+        return self.select(' OR '.join(conditions) or '0', params)
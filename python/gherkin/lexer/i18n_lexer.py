@@ -15,17 +15,82 @@ def lazy_split_lines(data):
             break
         yield data[last:current]
 
+def source_string(source):
+    """The lexers scan str and unicode. Other buffers (bytearray,
+    memoryview, buffer, mmap) are copied into a str."""
+    if isinstance(source, basestring):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return memoryview(source).tobytes()
+    return source[:]
+
 class I18nLexer(object):
-    def __init__(self, listener):
+    def __init__(self, listener, force_universal=False, **options):
         self.listener = listener
+        self.force_universal = force_universal
+        self.options = options
         self.i18n_language = None
+        self.universal = None
+        self.scanner = None
+        self.delegate = None
 
     def scan(self, source):
-        self.create_delegate(source).scan(source)
+        source = source_string(source)
+        delegate = self.create_delegate(source)
+        delegate.scan(source)
+        self.scanned(delegate)
+
+    def scan_file(self, path):
+        with open(path, 'rb') as f:
+            self.scan(f.read())
+
+    def feed(self, chunk):
+        # Only the universal lexer can be fed. It reads the language
+        # comment itself, as the chunks come in.
+        if self.delegate is None:
+            self.delegate = self.universal_lexer()
+        try:
+            self.delegate.feed(chunk)
+        except:
+            self.delegate = None
+            raise
+
+    def close(self):
+        if self.delegate is None:
+            self.delegate = self.universal_lexer()
+        delegate, self.delegate = self.delegate, None
+        delegate.close()
+        self.i18n_language = delegate.i18n_language
+
+    def tokenize(self, source):
+        # Only the universal lexer tokenizes
+        delegate = self.universal_lexer()
+        tokens = delegate.tokenize(source_string(source))
+        self.i18n_language = delegate.i18n_language
+        return tokens
+
+    def universal_lexer(self):
+        # One universal lexer serves every language
+        if self.universal is None:
+            self.universal = I18n.get('en').lexer(
+                self.listener, force_universal=True, **self.options)
+        return self.universal
 
     def create_delegate(self, source):
-        self.i18n_language = self.lang(source)
-        return self.i18n_language.lexer(self.listener)
+        if self.force_universal:
+            return self.universal_lexer()
+        i18n_language = self.lang(source)
+        # Lexers can scan one source after another, so the last one is kept
+        # for the next source in the same language
+        if self.scanner is None or i18n_language is not self.i18n_language:
+            self.scanner = i18n_language.lexer(self.listener, **self.options)
+        self.i18n_language = i18n_language
+        return self.scanner
+
+    def scanned(self, delegate):
+        # The universal lexer reads the language comment while it scans
+        if self.force_universal:
+            self.i18n_language = delegate.i18n_language
 
     def lang(self, source):
         key = 'en'
@@ -0,0 +1,19 @@
+# Token ids returned by UniversalLexer.tokenize() and I18nLexer.tokenize().
+
+EVENTS = (
+    'comment',
+    'tag',
+    'feature',
+    'background',
+    'scenario',
+    'scenario_outline',
+    'examples',
+    'step',
+    'doc_string',
+    'row',
+    'cell',
+    'eof',
+)
+
+(COMMENT, TAG, FEATURE, BACKGROUND, SCENARIO, SCENARIO_OUTLINE, EXAMPLES,
+ STEP, DOC_STRING, ROW, CELL, EOF) = range(len(EVENTS))
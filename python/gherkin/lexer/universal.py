@@ -0,0 +1,395 @@
+import re
+
+from gherkin.i18n import I18n
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import language_pattern
+from gherkin.lexer import tokens
+from gherkin.lexer.views import DescriptionView, DocStringView, unindent
+
+# Whitespace that may precede a token on its line
+SPACES = u' \t\x0b\x0c\r'
+# What the C lexer trims from the end of tokens
+TRAILING_SPACES = SPACES + u'\n'
+
+tag_line = re.compile(u'^(?:@[^@\r\n\t ]+[%s]*)+$' % SPACES)
+tag_pattern = re.compile(u'@[^@\r\n\t ]+')
+cell_pattern = re.compile(r'((?:\\\||[^|])*)\|')
+
+# What may start the line that ends the description of each heading, besides
+# the keywords: the first character of the line, and whether it may be the
+# end of the input.
+HEADING_ENDS = {
+    'feature': (('feature', 'background', 'scenario', 'scenario_outline',
+                 'examples'), u'@#', True),
+    'background': (('feature', 'scenario', 'scenario_outline', 'step'),
+                   u'@#', True),
+    'scenario': (('feature', 'background', 'scenario', 'scenario_outline',
+                  'step'), u'@#', True),
+    'scenario_outline': (('feature', 'scenario', 'step'), u'@#', True),
+    'examples': (('feature',), u'|#', False),
+}
+
+FEATURE_END = '%_FEATURE_END_%'
+
+class KeywordTrie(object):
+    """The keywords of one language, looked up by the longest one a line
+    starts with. Heading keywords are stored with their colon."""
+
+    def __init__(self, i18n):
+        self.root = {}
+        for key in I18n.FEATURE_ELEMENT_KEYS:
+            for keyword in i18n.keywords(key):
+                self.add(keyword + u':', (key, keyword))
+        for keyword in i18n.step_keywords():
+            self.add(keyword, ('step', keyword))
+
+    def add(self, word, value):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[None] = value
+
+    def match(self, text):
+        node = self.root
+        found = None
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found = node[None]
+        return found
+
+tries = {}
+
+def keyword_trie(iso_code):
+    trie = tries.get(iso_code)
+    if trie is None:
+        trie = tries[iso_code] = KeywordTrie(I18n.get(iso_code))
+    return trie
+
+def byte_offsets(text, offsets):
+    """The offsets of the UTF-8 encoding of text that the character
+    offsets in offsets map to."""
+    mapped = {}
+    last = at = 0
+    for offset in sorted(offsets):
+        at += len(text[last:offset].encode('utf8'))
+        mapped[offset] = at
+        last = offset
+    return mapped
+
+def split_row(stripped):
+    """The (offset, content) pairs of the cells of a row, and the offset
+    after its last closing pipe. Without a backslash there are no escaped
+    pipes, and the row is split as it is."""
+    cells = []
+    at = 1
+    if u'\\' not in stripped:
+        for content in stripped.split(u'|')[1:-1]:
+            cells.append((at, content))
+            at += len(content) + 1
+        return cells, at
+    while True:
+        match = cell_pattern.match(stripped, at)
+        if match is None:
+            break
+        cells.append((match.start(1), match.group(1)))
+        at = match.end()
+    return cells, at
+
+def source_text(source):
+    if isinstance(source, unicode):
+        return source
+    if isinstance(source, memoryview):
+        source = source.tobytes()
+    elif not isinstance(source, str):
+        source = source[:]
+    return source.decode('utf8')
+
+class UniversalLexer(object):
+    """A lexer for every language in i18n.yml, matching keywords with a trie
+    instead of a compiled state machine. The language starts as iso_code and
+    follows any '# language:' comment in the header of the source, so one
+    lexer can scan features in different languages.
+
+    With lazy_text, descriptions and doc strings of a scanned source are
+    passed as views of its text (gherkin.lexer.views), unindented the first
+    time they are read. Fed chunks are always unindented while lexing."""
+
+    def __init__(self, listener, iso_code='en', lazy_text=False):
+        self.listener = listener
+        self.iso_code = iso_code
+        self.lazy_text = lazy_text
+        self.i18n_language = None
+        self.stream = None
+        self.tokens = None
+        # The text being scanned, that lazy_text views are made of
+        self.text = None
+        self.reset()
+
+    def reset(self):
+        self.trie = keyword_trie(self.iso_code)
+        self.i18n_language = I18n.get(self.iso_code)
+        self.line_number = 0
+        self.line_start = self.next_line_start = 0
+        self.in_header = True
+        self.heading = None
+        self.doc_string = None
+
+    def scan(self, source):
+        if self.stream is not None:
+            raise RuntimeError('Lexer is being fed')
+        self.reset()
+        text = source_text(source)
+        if self.lazy_text:
+            self.text = text
+        try:
+            for line in text.split(u'\n'):
+                self.lex_line(line)
+            self.end()
+        finally:
+            self.text = None
+        return True
+
+    def tokenize(self, source):
+        """The (token, start, end, line) tuples of source, with the ids of
+        gherkin.lexer.tokens and offsets into its UTF-8 encoding. The
+        listener isn't called. Lexing costs the same as in scan(), only
+        the listener calls are saved."""
+        if self.stream is not None:
+            raise RuntimeError('Lexer is being fed')
+        text = source_text(source)
+        self.tokens = []
+        try:
+            self.scan(text)
+            found = self.tokens
+        finally:
+            self.tokens = None
+        if len(text.encode('utf8')) == len(text):
+            # The offsets into ASCII text are its byte offsets
+            return found
+        offsets = set()
+        for event, start, end, line in found:
+            offsets.add(start)
+            offsets.add(end)
+        mapped = byte_offsets(text, offsets)
+        return [(event, mapped[start], mapped[end], line)
+                for event, start, end, line in found]
+
+    def feed(self, chunk):
+        if isinstance(chunk, unicode):
+            chunk = chunk.encode('utf8')
+        elif isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        if self.stream is None:
+            self.reset()
+            self.stream = ''
+        lines = (self.stream + chunk).split('\n')
+        self.stream = lines.pop()
+        try:
+            for line in lines:
+                self.lex_line(line.decode('utf8'))
+        except:
+            self.stream = None
+            raise
+
+    def close(self):
+        stream, self.stream = self.stream, None
+        if stream is None:
+            self.reset()
+            stream = ''
+        self.lex_line(stream.decode('utf8'))
+        self.end()
+
+    def lex_line(self, line):
+        self.line_number += 1
+        self.line_start = self.next_line_start
+        self.next_line_start += len(line) + 1
+        if self.line_number == 1 and line.startswith(u'\ufeff'):
+            line = line[1:]
+            self.line_start += 1
+
+        if self.doc_string is not None:
+            self.lex_doc_string_line(line)
+            return
+
+        stripped = line.lstrip(SPACES)
+        indent = len(line) - len(stripped)
+        if self.heading is not None:
+            if not self.ends_heading(stripped):
+                self.heading[-1].append(line)
+                return
+            self.store_heading()
+
+        if not stripped:
+            return
+        if line.endswith(u'\r'):
+            stripped = stripped[:-1]
+
+        first = stripped[0]
+        if first == u'#':
+            if self.in_header:
+                self.detect_language(stripped)
+            if self.tokens is not None:
+                start = self.line_start + indent
+                self.tokens.append((tokens.COMMENT, start,
+                                    start + len(stripped), self.line_number))
+                return
+            self.listener.comment(stripped, self.line_number)
+            return
+        self.in_header = False
+
+        if first == u'@':
+            self.lex_tags(line, stripped)
+        elif first == u'|':
+            self.lex_row(line, stripped)
+        elif stripped.startswith(u'"""'):
+            self.doc_string = (stripped[3:].strip(), self.line_number,
+                               indent, self.next_line_start, [])
+        else:
+            self.lex_keyword(line, stripped, indent)
+
+    def ends_heading(self, stripped):
+        keys, chars, at_eof = HEADING_ENDS[self.heading[0]]
+        if not stripped:
+            return False
+        if stripped[0] in chars:
+            return True
+        match = self.trie.match(stripped)
+        return match is not None and match[0] in keys
+
+    def store_heading(self):
+        event, keyword, line, start_col, start, lines = self.heading
+        self.heading = None
+        if self.tokens is not None:
+            text = u'\n'.join(lines).rstrip(TRAILING_SPACES)
+            self.tokens.append((tokens.EVENTS.index(event), start,
+                                start + len(keyword) + 1 + len(text), line))
+            return
+        if self.text is not None:
+            name = lines[0].strip()
+            description = u''
+            if len(lines) > 1:
+                # The description starts on the line after the heading
+                begin = start + len(keyword) + 1 + len(lines[0]) + 1
+                end = begin + sum(len(text) + 1 for text in lines[1:]) - 1
+                description = DescriptionView(self.text, begin, end,
+                                              start_col)
+        else:
+            content = unindent(u'\n'.join(lines), start_col).split(u'\n')
+            name = content.pop(0).strip()
+            description = u'\n'.join(content).rstrip()
+        getattr(self.listener, event)(keyword, name, description, line)
+
+    def lex_keyword(self, line, stripped, indent):
+        match = self.trie.match(stripped)
+        if match is None:
+            self.error(line)
+        event, keyword = match
+        keyword = stripped[:len(keyword)]
+        if event == 'step':
+            name = stripped[len(keyword):]
+            if not name:
+                self.error(line)
+            if self.tokens is not None:
+                start = self.line_start + indent
+                self.tokens.append((tokens.STEP, start, start +
+                                    len(stripped.rstrip(TRAILING_SPACES)),
+                                    self.line_number))
+                return
+            self.listener.step(keyword, name.strip(), self.line_number)
+            return
+        content = line[indent + len(keyword) + 1:]
+        self.heading = (event, keyword, self.line_number, indent + 2,
+                        self.line_start + indent, [content])
+
+    def lex_tags(self, line, stripped):
+        if not tag_line.match(stripped):
+            self.error(line)
+        if self.tokens is not None:
+            start = self.line_start + len(line) - len(line.lstrip(SPACES))
+            for match in tag_pattern.finditer(stripped):
+                self.tokens.append((tokens.TAG, start + match.start(),
+                                    start + match.end(), self.line_number))
+            return
+        for tag in tag_pattern.findall(stripped):
+            self.listener.tag(tag, self.line_number)
+
+    def lex_row(self, line, stripped):
+        cells, at = split_row(stripped)
+        if stripped[at:].strip(SPACES):
+            self.error(line)
+        if self.tokens is not None:
+            self.tokenize_row(line, cells, at)
+            return
+        self.listener.row([self.cell(content) for offset, content in cells],
+                          self.line_number)
+
+    def tokenize_row(self, line, cells, at):
+        start = self.line_start + len(line) - len(line.lstrip(SPACES))
+        line_number = self.line_number
+        append = self.tokens.append
+        append((tokens.ROW, start, start + at, line_number))
+        for offset, content in cells:
+            left = len(content) - len(content.lstrip(u' \t'))
+            right = len(content.rstrip(TRAILING_SPACES))
+            append((tokens.CELL, start + offset + left,
+                    start + offset + max(left, right), line_number))
+
+    def cell(self, content):
+        return content.strip().replace(u'\\|', u'|') \
+            .replace(u'\\n', u'\n').replace(u'\\\\', u'\\')
+
+    def lex_doc_string_line(self, line):
+        at = line.find(u'"""')
+        if at == -1:
+            self.doc_string[-1].append(line)
+            return
+        if line[at + 3:].strip(SPACES):
+            self.error(line)
+        content_type, line_number, start_col, start, lines = self.doc_string
+        self.doc_string = None
+        if self.tokens is not None:
+            self.tokens.append((tokens.DOC_STRING, start,
+                                max(start, self.line_start - 1), line_number))
+            return
+        if self.text is not None:
+            self.listener.doc_string(
+                content_type, DocStringView(self.text, start,
+                                            max(start, self.line_start - 1),
+                                            start_col), line_number)
+            return
+        content = unindent(u'\n'.join(lines), start_col)
+        if content.endswith(u'\r'):
+            content = content[:-1]
+        content = content.replace(u'\\"\\"\\"', u'"""')
+        self.listener.doc_string(content_type, content, line_number)
+
+    def detect_language(self, comment):
+        match = language_pattern.match(comment)
+        if match:
+            self.i18n_language = I18n.get(match.group(1))
+            self.trie = keyword_trie(self.i18n_language.iso_code)
+
+    def end(self):
+        if self.doc_string is not None:
+            self.error(FEATURE_END, self.line_number + 1)
+        if self.heading is not None:
+            if not HEADING_ENDS[self.heading[0]][2]:
+                self.error(FEATURE_END, self.line_number + 1)
+            self.store_heading()
+        if self.tokens is not None:
+            self.tokens.append((tokens.EOF, self.next_line_start - 1,
+                                self.next_line_start - 1, self.line_number))
+            return
+        self.listener.eof()
+
+    def error(self, line, line_number=None):
+        if line_number is None:
+            line_number = self.line_number
+        self.doc_string = self.heading = self.stream = None
+        raise LexingError("Lexing error on line %d: '%s'. See "
+                          "http://wiki.github.com/cucumber/gherkin/lexingerror "
+                          "for more information." %
+                          (line_number, line.encode('utf8')))
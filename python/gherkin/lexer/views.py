@@ -0,0 +1,41 @@
+import re
+
+def unindent(text, start_col):
+    """Removes up to start_col spaces and tabs from the start of every line,
+    like the C lexers do. Their start_col is unsigned, so a negative one
+    removes all indentation."""
+    limit = start_col if start_col >= 0 else ''
+    return re.sub(u'(?m)^[ \t]{0,%s}' % limit, u'', text)
+
+class SourceView(object):
+    """Text that a lazy_text lexer hasn't unindented yet: the characters
+    from start to end of the source text it scanned. The model materializes
+    it with text() the first time it is read."""
+
+    def __init__(self, source, start, end, start_col):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.start_col = start_col
+
+    def text(self):
+        return unindent(self.source[self.start:self.end], self.start_col)
+
+    def __unicode__(self):
+        return self.text()
+
+    def __repr__(self):
+        return '<%s %d:%d>' % (self.__class__.__name__, self.start, self.end)
+
+class DescriptionView(SourceView):
+    """The lines of a feature element heading that follow its name."""
+
+    def text(self):
+        return super(DescriptionView, self).text().rstrip()
+
+class DocStringView(SourceView):
+    def text(self):
+        value = super(DocStringView, self).text()
+        if value.endswith(u'\r'):
+            value = value[:-1]
+        return value.replace(u'\\"\\"\\"', u'"""')
@@ -1,8 +1,19 @@
 from gherkin.formatter import model
 
 class FormatterListener(object):
-    def __init__(self, formatter):
+    def __init__(self, formatter, columnar=False, pool=None):
         self.formatter = formatter
+        # Equal keywords, names, tags and cells share one string from the
+        # pool
+        self.pool = pool
+        # Cells shared by the tables of every document, when they're
+        # columnar
+        self.cells = None
+        if columnar:
+            self.cells = pool if pool is not None else {}
+        self.reset()
+
+    def reset(self):
         self.comments = []
         self.tags = []
         self.rows = []
@@ -14,42 +25,50 @@ class FormatterListener(object):
         self.comments.append(model.Comment(value, line))
 
     def tag(self, name, line):
-        self.tags.append(model.Tag(name, line))
+        self.tags.append(model.Tag(self.intern(name), line))
 
     def feature(self, keyword, name, description, line):
         feature = model.Feature(self.grab_comments(), self.grab_tags(),
-                                keyword, name, description, line)
+                                self.intern(keyword), self.intern(name),
+                                description, line)
         self.formatter.feature(feature)
 
     def background(self, keyword, name, description, line):
-        background = model.Background(self.grab_comments(), keyword, name,
+        background = model.Background(self.grab_comments(),
+                                      self.intern(keyword), self.intern(name),
                                       description, line)
         self.formatter.background(background)
 
     def scenario(self, keyword, name, description, line):
         self.replay_step_or_examples()
         scenario = model.Scenario(self.grab_comments(), self.grab_tags(),
-                                  keyword, name, description, line)
+                                  self.intern(keyword), self.intern(name),
+                                  description, line)
         self.formatter.scenario(scenario)
 
     def scenario_outline(self, keyword, name, description, line):
         self.replay_step_or_examples()
         outline = model.ScenarioOutline(self.grab_comments(), self.grab_tags(),
-                                        keyword, name, description, line)
+                                        self.intern(keyword),
+                                        self.intern(name), description, line)
         self.formatter.scenario_outline(outline)
 
     def examples(self, keyword, name, description, line):
         self.replay_step_or_examples()
         examples = model.Examples(self.grab_comments(), self.grab_tags(),
-                                  keyword, name, description, line, None)
+                                  self.intern(keyword), self.intern(name),
+                                  description, line, None)
         self.examples_statement = examples
 
     def step(self, keyword, name, line):
         self.replay_step_or_examples()
-        step = model.Step(self.grab_comments(), keyword, name, line)
+        step = model.Step(self.grab_comments(), self.intern(keyword),
+                          self.intern(name), line)
         self.step_statement = step
 
     def row(self, cells, line):
+        if self.pool is not None:
+            cells = [self.intern(cell) for cell in cells]
         self.rows.append(model.Row(self.grab_comments(), cells, line))
 
     def doc_string(self, string, content_type, line):
@@ -62,6 +81,12 @@ class FormatterListener(object):
     def syntax_error(self, state, ev, legal_events, uri, line):
         self.formatter.syntax_error(state, ev, legal_events, uri, line)
 
+    def intern(self, value):
+        if self.pool is None:
+            return value
+        value = model.ensure_unicode(value)
+        return self.pool.setdefault(value, value)
+
     def grab_comments(self):
         comments = self.comments
         self.comments = []
@@ -72,19 +97,28 @@ class FormatterListener(object):
         self.tags = []
         return tags
 
+    def table(self, rows):
+        if self.cells is not None:
+            try:
+                return model.DataTable.from_rows(rows, self.cells)
+            except ValueError:
+                # Rows of different lengths stay Rows
+                pass
+        return rows
+
     def replay_step_or_examples(self):
         if self.step_statement is not None:
             if self.doc_string_statement is not None:
                 self.step_statement.doc_string = self.doc_string_statement
                 self.doc_string_statement = None
             elif self.rows:
-                self.step_statement.rows = self.rows
+                self.step_statement.rows = self.table(self.rows)
                 self.rows = []
             self.formatter.step(self.step_statement)
             self.step_statement = None
         if self.examples_statement is not None:
             if self.rows:
-                self.examples_statement.rows = self.rows
+                self.examples_statement.rows = self.table(self.rows)
                 self.rows = []
             self.formatter.examples(self.examples_statement)
             self.examples_statement = None
@@ -0,0 +1,163 @@
+"""Expands scenario outlines into the scenarios of their examples rows, one
+row at a time."""
+
+import re
+
+from gherkin.formatter import model
+
+placeholder = re.compile(u'(<[^<>]*>)')
+
+class Template(object):
+    """Text with <placeholders>, split once into the literal parts and the
+    placeholders between them."""
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = placeholder.split(text)
+
+    def arguments(self):
+        arguments = []
+        offset = 0
+        for i, part in enumerate(self.parts):
+            if i % 2:
+                arguments.append(model.Argument(offset, part))
+            offset += len(part)
+        return arguments
+
+    def compile(self, header):
+        """The (part, column) of each placeholder named in header."""
+        columns = dict((u'<%s>' % name, i) for i, name in enumerate(header))
+        return tuple((i, columns[part])
+                     for i, part in enumerate(self.parts)
+                     if i % 2 and part in columns)
+
+    def render(self, cells, slots):
+        if not slots:
+            return self.text
+        parts = list(self.parts)
+        for i, column in slots:
+            if column < len(cells):
+                parts[i] = cells[column]
+        return u''.join(parts)
+
+class OutlineStep(object):
+    """A step of an outline, with templates for its name and argument."""
+
+    def __init__(self, step):
+        self.step = step
+        self.name = Template(step.name)
+        self.rows = None
+        self.doc_string = None
+        if step.rows:
+            self.rows = [(row, [Template(cell) for cell in row.cells])
+                         for row in step.rows]
+        elif step.doc_string is not None:
+            self.doc_string = Template(step.doc_string.value)
+
+    def compile(self, header):
+        rows = None
+        if self.rows is not None:
+            rows = [(row, [(cell, cell.compile(header)) for cell in cells])
+                    for row, cells in self.rows]
+        doc_string = None
+        if self.doc_string is not None:
+            doc_string = self.doc_string.compile(header)
+        return self.name.compile(header), rows, doc_string
+
+    def expand(self, cells, compiled):
+        name_slots, rows, doc_string_slots = compiled
+        step = self.step
+        expanded = model.Step(step.comments, step.keyword,
+                              self.name.render(cells, name_slots), step.line)
+        if rows is not None:
+            expanded.rows = [
+                model.Row(row.comments,
+                          [cell.render(cells, slots)
+                           for cell, slots in row_cells], row.line)
+                for row, row_cells in rows]
+        elif doc_string_slots is not None:
+            doc_string = step.doc_string
+            expanded.doc_string = model.DocString(
+                doc_string.content_type,
+                self.doc_string.render(cells, doc_string_slots),
+                doc_string.line)
+        return expanded
+
+class Outline(object):
+    """A scenario outline with its steps and examples. scenarios() builds
+    the scenario of each examples row as it's asked for, so outlines with
+    big examples tables can be streamed."""
+
+    def __init__(self, scenario_outline, steps, examples):
+        self.scenario_outline = scenario_outline
+        self.name = Template(scenario_outline.name)
+        self.steps = [OutlineStep(step) for step in steps]
+        self.examples = examples
+
+    def scenarios(self):
+        """Yields (examples, scenario, steps) for every examples row."""
+        outline = self.scenario_outline
+        for examples in self.examples:
+            rows = examples.rows
+            if not rows:
+                continue
+            header = rows[0].cells
+            name_slots = self.name.compile(header)
+            steps = [(step, step.compile(header)) for step in self.steps]
+            tags = outline.tags + examples.tags
+            for i in xrange(1, len(rows)):
+                row = rows[i]
+                cells = row.cells
+                scenario = model.Scenario(
+                    row.comments, tags, outline.keyword,
+                    self.name.render(cells, name_slots),
+                    outline.description, row.line)
+                yield examples, scenario, [step.expand(cells, compiled)
+                                           for step, compiled in steps]
+
+class OutlineExpander(object):
+    """Passes formatter calls on to formatter, replacing each scenario
+    outline and its examples with the scenarios they expand to."""
+
+    def __init__(self, formatter):
+        self.formatter = formatter
+        self.outline = None
+        self.outline_steps = []
+        self.outline_examples = []
+
+    def __getattr__(self, name):
+        return getattr(self.formatter, name)
+
+    def scenario(self, scenario):
+        self.expand()
+        self.formatter.scenario(scenario)
+
+    def scenario_outline(self, scenario_outline):
+        self.expand()
+        self.outline = scenario_outline
+
+    def step(self, step):
+        if self.outline is not None:
+            self.outline_steps.append(step)
+        else:
+            self.formatter.step(step)
+
+    def examples(self, examples):
+        self.outline_examples.append(examples)
+
+    def eof(self):
+        self.expand()
+        self.formatter.eof()
+
+    def expand(self):
+        if self.outline is None:
+            return
+        outline = Outline(self.outline, self.outline_steps,
+                          self.outline_examples)
+        self.outline = None
+        self.outline_steps = []
+        self.outline_examples = []
+        for examples, scenario, steps in outline.scenarios():
+            self.formatter.scenario(scenario)
+            for step in steps:
+                self.formatter.step(step)
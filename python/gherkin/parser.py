@@ -1,66 +1,129 @@
 import os.path
-import types
 
 from gherkin.i18n import I18n
+from gherkin.lexer.exceptions import LexingError
 from gherkin.lexer.i18n_lexer import I18nLexer
 from gherkin.listener import FormatterListener
 from gherkin.formatter.pretty_formatter import PrettyFormatter
+from gherkin.parser_tables import EVENTS, MACHINES, STATES, TRANSITIONS
+
+here = os.path.dirname(__file__)
+
+# Transitions that don't go to a state of the same machine
+ERROR = -1
+POP = -2
+PUSH = -3
+
+EVENT_IDS = dict((event, i) for i, event in enumerate(EVENTS))
+MACHINE_IDS = dict((name, i) for i, name in enumerate(MACHINES))
+EVENT_COUNT = len(EVENTS)
 
 class ParseError(Exception):
     pass
 
+def handle_event(event):
+    # Moves the state machines, then builds the model, with no calls in
+    # between unless the event is a syntax error
+    event_id = EVENT_IDS[event]
+    on_event = FormatterListener.__dict__[event]
+    def handler(self, *args):
+        machines = self.machines
+        states = self.states
+        while True:
+            new_state = TRANSITIONS[machines[-1]][
+                states[-1] * EVENT_COUNT + event_id]
+            if new_state >= 0:
+                states[-1] = new_state
+                break
+            elif new_state == POP:
+                machines.pop()
+                states.pop()
+            elif new_state == ERROR:
+                self.syntax_error(event_id, args[-1] if args else None)
+                break
+            else:
+                machines.append(PUSH - new_state)
+                states.append(0)
+        on_event(self.listener, *args)
+    return handler
+
 class Parser(object):
-    def __init__(self, formatter, raise_on_error=True, machine_name='root'):
+    def __init__(self, formatter, raise_on_error=True, machine_name='root',
+                 force_universal=False, cache=None, columnar=False,
+                 pool=None):
         self.formatter = formatter
         self.raise_on_error = raise_on_error
         self.machine_name = machine_name
+        self.cache = cache
+        self.columnar = columnar
+        self.pool = pool
 
         self.line_offset = None
         self.i18n_language = None
         self.feature_uri = None
 
-        self.listener = FormatterListener(self.formatter)
+        self.listener = FormatterListener(self.formatter, columnar, pool)
+        # The running machines and their states, innermost last
         self.machines = []
+        self.states = []
         self.push_machine(machine_name)
-        self.lexer = I18nLexer(self)
+        self.lexer = I18nLexer(self, force_universal)
 
     def parse(self, gherkin, feature_uri, line_offset):
         self.feature_uri = feature_uri
         self.formatter.uri(feature_uri)
         self.line_offset = line_offset
-        self.lexer.scan(gherkin)
-
-    def __getattr__(self, name):
-        attr = getattr(self.listener, name)
-        if type(attr) is not types.MethodType:
-            raise AttributeError
-        def wrapper(*args):
-            if args[0] is self:
-                args = args[1:]
-            if name == u'eof':
-                self.event(name, None)
+        # Replayed models wouldn't share the strings of the pool
+        if self.cache is not None and self.pool is None:
+            self.cache.parse(self, gherkin)
+        else:
+            self.lexer.scan(gherkin)
+
+    def parse_many(self, documents, line_offset=0):
+        """Parses each (source, uri) pair in documents with this parser,
+        yielding (uri, None) for a document that parsed and (uri, error) for
+        one that raised a ParseError or LexingError, or wasn't UTF-8."""
+        for source, uri in documents:
+            self.reset()
+            try:
+                self.parse(source, uri, line_offset)
+            except (ParseError, LexingError, UnicodeDecodeError), e:
+                yield uri, e
             else:
-                self.event(name, args[-1])
-            attr(*args)
-            if name == u'eof':
-                self.pop_machine()
-                self.push_machine(self.machine_name)
+                yield uri, None
+
+    def reset(self):
+        # Forgets what's left of a document that failed to parse
+        del self.machines[:]
+        del self.states[:]
+        self.push_machine(self.machine_name)
+        self.listener.reset()
+
+    comment = handle_event(u'comment')
+    tag = handle_event(u'tag')
+    feature = handle_event(u'feature')
+    background = handle_event(u'background')
+    scenario = handle_event(u'scenario')
+    scenario_outline = handle_event(u'scenario_outline')
+    examples = handle_event(u'examples')
+    step = handle_event(u'step')
+    doc_string = handle_event(u'doc_string')
+    row = handle_event(u'row')
+    eof_event = handle_event(u'eof')
 
-        setattr(self, name, wrapper)
-        return wrapper.__get__(self, self.__class__)
+    def eof(self):
+        self.eof_event()
+        self.pop_machine()
+        self.push_machine(self.machine_name)
 
-    def event(self, event, line):
+    def syntax_error(self, event_id, line):
         if line:
             line = self.line_offset + line
         else:
             line = None
-
-        self.machine.event(event, line)
-        if not self.machine.error:
-            return
-
-        state = self.machine.state
-        legal_events = self.machine.expected
+        state = self.state
+        event = EVENTS[event_id]
+        legal_events = self.expected
 
         if self.raise_on_error:
             raise ParseError(state, event, legal_events, self.feature_uri, line)
@@ -69,21 +132,28 @@ class Parser(object):
                                        self.feature_uri, line)
 
     def push_machine(self, name):
-        self.machines.append(Machine(self, name))
+        self.machines.append(MACHINE_IDS[name])
+        self.states.append(0)
 
     def pop_machine(self):
         self.machines.pop()
+        self.states.pop()
 
     @property
-    def machine(self):
-        return self.machines[-1]
+    def state(self):
+        return STATES[self.machines[-1]][self.states[-1]]
 
     @property
     def expected(self):
-        return self.machine.expected
+        transitions = TRANSITIONS[self.machines[-1]]
+        start = self.states[-1] * len(EVENTS)
+        events = [event for i, event in enumerate(EVENTS)
+                  if transitions[start + i] != ERROR and event != u'eof']
+        events.sort()
+        return events
 
     def force_state(self, state):
-        self.machine.state = state
+        self.states[-1] = STATES[self.machines[-1]].index(state)
 
 class StateMachineReader(object):
     def __init__(self):
@@ -98,68 +168,65 @@ class StateMachineReader(object):
     def eof(self):
         pass
 
-class Machine(object):
-    transition_maps = {}
-
-    def __init__(self, parser, name):
-        self.parser = parser
-        self.name = name
-
-        self.transition_map = self._transition_map(name)
-        self.state = name
-
-        self.legal_events = None
-        self.error = False
-
-    def event(self, event, line):
-        states = self.transition_map[self.state]
-
-        new_state = states[event]
-
-        if new_state == 'E':
-            self.error = True
-            return
-
-        if new_state.startswith('push('):
-            self.parser.push_machine(new_state[5:-1])
-            self.parser.event(event, line)
-        elif new_state == 'pop()':
-            self.parser.pop_machine()
-            self.parser.event(event, line)
-        else:
-            if new_state is None:
-                raise ParseError()
-            self.state = new_state
-
-    @property
-    def expected(self):
-        transition_map = self.transition_map[self.state]
-        events = [s for s in transition_map if transition_map[s] != 'E']
-        events.sort()
-        events.remove(u'eof')
-        return events
-
-    def _transition_map(self, name):
-        transition_map = self.transition_maps.get(name, None)
-        if transition_map is not None:
-            return transition_map
-
-        transition_map = self.build_transition_map(name)
-        self.transition_maps[name] = transition_map
-        return transition_map
-
-    def build_transition_map(self, name):
-        table = self.transition_table(name)
-        events = table.pop(0)[1:]
-        transition_map = {}
-        for row in table:
-            transition_map[row[0]] = dict(zip(events, row[1:]))
-        return transition_map
-
-    def transition_table(self, name):
-        state_machine_reader = StateMachineReader()
-        lexer = I18n('en').lexer(state_machine_reader)
-        machine = os.path.dirname(__file__)
-        machine = os.path.join(machine, 'parser_data', name + '.txt')
-        lexer.scan(open(machine).read())
-        return state_machine_reader.rows
+def transition_table(name):
+    state_machine_reader = StateMachineReader()
+    lexer = I18n.get('en').lexer(state_machine_reader)
+    machine = os.path.join(here, 'parser_data', name + '.txt')
+    lexer.scan(open(machine).read())
+    return state_machine_reader.rows
+
+def compile_tables(target=os.path.join(here, 'parser_tables.py')):
+    """Writes the state machines in parser_data/*.txt to a module of integer
+    tables. A machine's transitions are indexed by state * len(EVENTS) +
+    event. They hold the new state, ERROR, POP, or PUSH - machine for a
+    push(machine)."""
+    names = sorted(name[:-4]
+                   for name in os.listdir(os.path.join(here, 'parser_data'))
+                   if name.endswith('.txt'))
+    tables = dict((name, transition_table(name)) for name in names)
+    events = tables[names[0]][0][1:]
+
+    states = []
+    transitions = []
+    for name in names:
+        table = tables[name]
+        if table[0][1:] != events:
+            raise ValueError('Events of %s differ' % name)
+        rows = table[1:]
+        # Machines start in the state named after them
+        rows.sort(key=lambda row: row[0] != name)
+        state_ids = dict((row[0], i) for i, row in enumerate(rows))
+        codes = []
+        for row in rows:
+            codes.append([])
+            for action in row[1:]:
+                if action == 'E':
+                    codes[-1].append(ERROR)
+                elif action == 'pop()':
+                    codes[-1].append(POP)
+                elif action.startswith('push('):
+                    codes[-1].append(PUSH - names.index(action[5:-1]))
+                else:
+                    codes[-1].append(state_ids[action])
+        states.append(tuple(str(row[0]) for row in rows))
+        transitions.append(codes)
+
+    with open(target, 'w') as f:
+        f.write('# Generated from parser_data/*.txt by '
+                'gherkin.parser.compile_tables(), do not edit.\n\n')
+        f.write('EVENTS = (\n')
+        for event in events:
+            f.write('    %r,\n' % (event,))
+        f.write(')\n\nMACHINES = %r\n\nSTATES = (\n' %
+                (tuple(str(name) for name in names),))
+        for machine_states in states:
+            f.write('    %r,\n' % (machine_states,))
+        f.write(')\n\nTRANSITIONS = (\n')
+        for name, machine_states, codes in zip(names, states, transitions):
+            f.write('    # %s\n    (\n' % name)
+            for state, row in zip(machine_states, codes):
+                f.write('        %s  # %s\n' %
+                        (''.join('%d, ' % code for code in row).rstrip(),
+                         state))
+            f.write('    ),\n')
+        f.write(')\n')
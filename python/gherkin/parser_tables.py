@@ -0,0 +1,52 @@
+# Generated from parser_data/*.txt by gherkin.parser.compile_tables(), do not edit.
+
+EVENTS = (
+    u'feature',
+    u'background',
+    u'scenario',
+    u'scenario_outline',
+    u'examples',
+    u'step',
+    u'row',
+    u'doc_string',
+    u'eof',
+    u'comment',
+    u'tag',
+)
+
+MACHINES = ('meta', 'root', 'steps')
+
+STATES = (
+    ('meta', 'comment', 'tag', 'eof'),
+    ('root', 'feature', 'step', 'outline_step', 'background', 'scenario', 'scenario_outline', 'examples', 'examples_table', 'eof'),
+    ('steps', 'step', 'eof'),
+)
+
+TRANSITIONS = (
+    # meta
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, 3, 1, 2,  # meta
+        -2, -2, -2, -2, -2, -2, -2, -2, 3, -2, 2,  # comment
+        -2, -1, -2, -2, -2, -1, -1, -1, -1, -1, 2,  # tag
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,  # eof
+    ),
+    # root
+    (
+        1, -1, -1, -1, -1, -1, -1, -1, 9, -3, -3,  # root
+        -1, 4, 5, 6, -1, -1, -1, -1, 9, -3, -3,  # feature
+        -1, -1, 5, 6, -1, 2, 2, 2, 9, -3, -3,  # step
+        -1, -1, 5, 6, 7, 3, 3, 3, 9, -3, -3,  # outline_step
+        -1, -1, 5, 6, -1, 2, -1, -1, 9, -3, -3,  # background
+        -1, -1, 5, 6, -1, 2, -1, -1, 9, -3, -3,  # scenario
+        -1, -1, -1, -1, -1, 3, -1, -1, 9, -3, -3,  # scenario_outline
+        -1, -1, -1, -1, -1, -1, 8, -1, 9, -3, -3,  # examples
+        -1, -1, 5, 6, 7, -1, 8, -1, 9, -3, -3,  # examples_table
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,  # eof
+    ),
+    # steps
+    (
+        -1, -1, -1, -1, -1, 1, -1, -1, 2, -1, -1,  # steps
+        -1, -1, -1, -1, -1, 1, 1, 0, 2, -1, -1,  # step
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,  # eof
+    ),
+)
@@ -1,4 +1,5 @@
 from gherkin.formatter import model
+from gherkin.lexer.views import SourceView
 
 def handle_event(event):
     def handler(self, *args):
@@ -45,4 +46,6 @@ class SexpRecorder(object):
             return obj.value
         elif type(obj) is model.Tag:
             return obj.name
+        elif isinstance(obj, SourceView):
+            return obj.text()
         return obj
@@ -1,26 +1,47 @@
 class TagExpression(object):
+    """Tag expressions compiled into a bit for each tag they name, and a
+    mask of the bits of each group of ORed tags. Tags are evaluated by
+    ORing their bits together and testing the mask of every group."""
+
     def __init__(self, tag_expressions):
         self.ands = []
         self.limits = {}
+        self.bits = {}
+        self.masks = []
         
         for expr in tag_expressions:
             self.add([e.strip() for e in expr.strip().split(',')])
     
     def eval(self, tags):
-        if not self.ands:
-            return True
-        
-        params = dict([(tag, True) for tag in tags])
-        
-        def test_tag(tag):
-            if tag.startswith('~'):
-                return not params.get(tag[1:], False)
-            return params.get(tag, False)
-        
-        for ors in self.ands:
-            if not ors:
-                continue
-            if True not in [test_tag(tag) for tag in ors]:
+        bits = self.bits
+        mask = 0
+        for tag in tags:
+            mask |= bits.get(tag, 0)
+        return self.eval_mask(mask)
+    
+    def eval_many(self, tag_lists):
+        """eval() of each of tag_lists, in a list. Each combination of the
+        tags in the expression is only tested once."""
+        bits = self.bits
+        results = []
+        cache = {}
+        for tags in tag_lists:
+            mask = 0
+            for tag in tags:
+                mask |= bits.get(tag, 0)
+            result = cache.get(mask)
+            if result is None:
+                result = cache[mask] = self.eval_mask(mask)
+            results.append(result)
+        return results
+    
+    def eval_mask(self, mask):
+        for group, negated in self.masks:
+            if negated:
+                # Fails only when every one of the tags is there
+                if mask & group == group:
+                    return False
+            elif not mask & group:
                 return False
         return True
     
@@ -30,6 +51,20 @@ class TagExpression(object):
         
         self.ands.append(self.store_and_extract_limits(negatives, True))
         self.ands.append(self.store_and_extract_limits(positives, False))
+        self.compile(self.ands[-2], True)
+        self.compile(self.ands[-1], False)
+    
+    def compile(self, ors, negated):
+        if not ors:
+            return
+        group = 0
+        for tag in ors:
+            if negated:
+                tag = tag[1:]
+            if tag not in self.bits:
+                self.bits[tag] = 1 << len(self.bits)
+            group |= self.bits[tag]
+        self.masks.append((group, negated))
     
     def store_and_extract_limits(self, tags, negated):
         tags_with_negation = []
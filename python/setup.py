@@ -3,6 +3,8 @@ import os.path
 
 from setuptools import setup, Extension
 
+from gherkin import __version__
+
 extensions = []
 for lexer_src in os.listdir('src'):
     name = lexer_src.split('.', 1)[0]
@@ -12,6 +14,6 @@ for lexer_src in os.listdir('src'):
 
 setup(
     name='gherkin',
-    version='2.41',
+    version=__version__,
     ext_modules=extensions,
 )
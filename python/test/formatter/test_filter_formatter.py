@@ -6,7 +6,9 @@ import unittest
 from nose import tools
 
 from gherkin.parser import Parser
+from gherkin.formatter import model
 from gherkin.formatter.filter_formatter import FilterFormatter
+from gherkin.formatter.filters import LineFilter
 from gherkin.formatter.pretty_formatter import PrettyFormatter
 
 class FilterFormatterTestCase(unittest.TestCase):
@@ -19,9 +21,7 @@ class FilterFormatterTestCase(unittest.TestCase):
         filter_formatter = FilterFormatter(pretty_formatter, filters)
         parser = Parser(filter_formatter)
         
-        path = os.path.dirname(__file__)
-        path = os.path.join(path, '..', '..', '..', 'spec', 'gherkin')
-        path = os.path.join(path, 'fixtures', self.file)
+        path = self.fixture_path()
         source = open(path).read() + "# __EOF__"
         parser.parse(source, path, 0)
         
@@ -32,6 +32,11 @@ class FilterFormatterTestCase(unittest.TestCase):
         expected = '\n'.join(expected)
         expected = expected.replace('# __EOF__', '')
         tools.eq_(io.getvalue(), expected)
+    
+    def fixture_path(self):
+        path = os.path.dirname(__file__)
+        path = os.path.join(path, '..', '..', '..', 'spec', 'gherkin')
+        return os.path.join(path, 'fixtures', self.file)
 
 class TestFilterFormatterTags(FilterFormatterTestCase):
     def test_filter_on_feature_tag(self):
@@ -150,3 +155,33 @@ class TestFilterFormatterLines6(FilterFormatterTestCase):
     
     def test_filter_on_last_pystring_quote(self):
         self.verify_filter([44], (1, 14), (38, 45))
+
+class TestFilterFormatterLinesByUri(FilterFormatterTestCase):
+    def test_filter_on_the_lines_of_the_uri(self):
+        self.verify_filter({self.fixture_path(): [16, 53]},
+                           (1, 19), (46, 53), (55, 55))
+    
+    def test_filter_out_other_uris(self):
+        self.verify_filter({'other.feature': [16]}, (1, 0))
+
+class TestLineFilter(unittest.TestCase):
+    def test_match_ranges_containing_a_line(self):
+        line_filter = LineFilter(range(1000, 0, -7))
+        tools.eq_([line_filter.eval([], [], [(first, first + 5)])
+                   for first in (0, 1, 2, 3, 996, 1001)],
+                  [False, True, True, True, True, False])
+    
+    def test_filter_table_rows_by_line(self):
+        rows = [model.Row([], [unicode(line)], line) for line in range(5)]
+        tools.eq_([row.line for row in
+                   LineFilter([3, 1]).filter_table_body_rows(rows)],
+                  [0, 1, 3])
+    
+    def test_switch_lines_by_uri(self):
+        line_filter = LineFilter({'a.feature': [3], 'b.feature': [9]})
+        tools.eq_(line_filter.eval([], [], [(1, 5)]), False)
+        line_filter.uri('a.feature')
+        tools.eq_(line_filter.eval([], [], [(1, 5)]), True)
+        line_filter.uri('b.feature')
+        tools.eq_(line_filter.eval([], [], [(1, 5)]), False)
+        tools.eq_(line_filter.eval([], [], [(6, 9)]), True)
@@ -1,6 +1,8 @@
+import cPickle as pickle
 import unittest
 
 from gherkin.formatter import model
+from gherkin.lexer.views import DescriptionView, DocStringView
 
 class TestTag(unittest.TestCase):
     def test_equal_when_name_is_equal(self):
@@ -17,3 +19,146 @@ class TestStep(unittest.TestCase):
     def test_provide_no_arguments_when_there_are_no_outline_tokens(self):
         step = model.Step([], 'Given ', "I have 33 cukes in my belly", 10)
         assert step.outline_args() == []
+
+class TestLazyText(unittest.TestCase):
+    source = (u'Feature: Hi\n'
+              u'    Line one\n'
+              u'      indented  \n'
+              u'  \n'
+              u'    """\n'
+              u'    {"a": \\"\\"\\"}\r\n'
+              u'    """\n')
+
+    def test_materialize_description_on_first_access(self):
+        view = DescriptionView(self.source, 12, 48, 4)
+        feature = model.Feature([], [], 'Feature', 'Hi', view, 1)
+        assert feature._description is view
+        assert feature.description == u'Line one\n  indented'
+        assert feature._description == u'Line one\n  indented'
+
+    def test_materialize_doc_string_on_first_access(self):
+        start = self.source.index('{')
+        end = self.source.index('\n', start)
+        doc_string = model.DocString(u'', DocStringView(self.source, start,
+                                                        end, 4), 5)
+        assert doc_string.value == u'{"a": """}'
+
+    def test_serialize_materialized_text(self):
+        view = DescriptionView(self.source, 12, 48, 4)
+        feature = model.Feature([], [], 'Feature', 'Hi', view, 1)
+        result = feature.to_dict()
+        assert result['description'] == u'Line one\n  indented'
+        assert '_description' not in result
+
+class TestSlots(unittest.TestCase):
+    def test_keep_no_instance_dict(self):
+        models = [model.Feature([], [], 'Feature', 'f', '', 1),
+                  model.Step([], 'Given ', 'x', 2),
+                  model.Row([], ['a'], 3),
+                  model.Tag('@x', 1),
+                  model.Comment('# c', 1),
+                  model.DocString('', 'd', 4)]
+        for m in models:
+            assert not hasattr(m, '__dict__'), m
+
+    def test_serialize_the_declared_fields(self):
+        step = model.Step([model.Comment('# c', 1)], 'Given ', 'x', 2)
+        step.rows = [model.Row([], ['a'], 3)]
+        assert step.to_dict() == {
+            'comments': [{'value': u'# c', 'line': 1}],
+            'keyword': u'Given ',
+            'name': u'x',
+            'line': 2,
+            'rows': [{'cells': [u'a'], 'line': 3}],
+        }
+
+    def test_pickle(self):
+        feature = model.Feature([], [model.Tag('@x', 1)], 'Feature', 'f',
+                                'd', 2)
+        for protocol in (0, 1, 2):
+            copy = pickle.loads(pickle.dumps(feature, protocol))
+            assert copy.to_dict() == feature.to_dict()
+
+    def test_pickle_with_the_default_protocol(self):
+        tag = pickle.loads(pickle.dumps(model.Tag(u'@a', 1)))
+        assert (tag.name, tag.line) == (u'@a', 1)
+        step = model.Step([], 'Given ', '<x> and <y>', 3)
+        step.doc_string = model.DocString('', 'd', 4)
+        copy = pickle.loads(pickle.dumps(step))
+        assert copy.to_dict() == step.to_dict()
+        assert [(arg.offset, arg.val) for arg in
+                pickle.loads(pickle.dumps(step.outline_args()))] == \
+            [(0, u'<x>'), (8, u'<y>')]
+
+    def test_pickle_lazy_text_as_text(self):
+        view = DescriptionView(TestLazyText.source, 12, 48, 4)
+        feature = model.Feature([], [], 'Feature', 'Hi', view, 1)
+        copy = pickle.loads(pickle.dumps(feature))
+        assert copy._description == u'Line one\n  indented'
+
+class TestSerializers(unittest.TestCase):
+    def test_serialize_every_kind_of_field(self):
+        view = DescriptionView(TestLazyText.source, 12, 48, 4)
+        outline = model.ScenarioOutline([], [model.Tag('@t', 1)],
+                                        'Scenario Outline', 'o', view, 2)
+        step = model.Step([], 'Given ', '<x>', 3)
+        step.doc_string = model.DocString('', 'd', 4)
+        examples = model.Examples([], [], 'Examples', 'e', '', 7,
+                                  [model.Row([], ['x'], 8)])
+        assert model.to_dicts([outline, step, examples]) == [
+            {'type': 'scenario_outline', 'tags': [{'name': u'@t', 'line': 1}],
+             'keyword': u'Scenario Outline', 'name': u'o',
+             'description': u'Line one\n  indented', 'line': 2},
+            {'keyword': u'Given ', 'name': u'<x>', 'line': 3,
+             'doc_string': {'content_type': u'', 'value': u'd', 'line': 4}},
+            {'keyword': u'Examples', 'name': u'e', 'description': u'',
+             'line': 7, 'rows': [{'cells': [u'x'], 'line': 8}]},
+        ]
+
+    def test_generate_serializers_for_subclasses(self):
+        class Noted(model.Step):
+            __slots__ = ('note',)
+
+        step = Noted([], 'Given ', 'x', 2)
+        step.note = u'n'
+        assert step.to_dict()['note'] == u'n'
+        assert model.Step([], 'Given ', 'x', 2).to_dict().get('note') is None
+
+class TestDataTable(unittest.TestCase):
+    def setUp(self):
+        self.rows = [model.Row([], [u'name', u'count'], 5),
+                     model.Row([model.Comment(u'# c', 6)], [u'a', u'1'], 7),
+                     model.Row([], [u'b', u'1'], 8)]
+        self.table = model.DataTable.from_rows(self.rows)
+
+    def test_read_as_rows(self):
+        assert len(self.table) == 3
+        assert [row.to_dict() for row in self.table] == \
+            [row.to_dict() for row in self.rows]
+        assert self.table[-1].line == 8
+        assert [row.line for row in self.table[1:]] == [7, 8]
+
+    def test_share_equal_cells(self):
+        assert self.table.row(1)[1] is self.table.row(2)[1]
+
+    def test_access_rows_columns_and_hashes(self):
+        assert self.table.header == [u'name', u'count']
+        assert self.table.row(1) == [u'a', u'1']
+        assert self.table.column(u'name') == [u'a', u'b']
+        assert self.table.column(1) == [u'1', u'1']
+        assert self.table.hashes() == [{u'name': u'a', u'count': u'1'},
+                                       {u'name': u'b', u'count': u'1'}]
+
+    def test_pickle(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(self.table, protocol))
+            assert [row.to_dict() for row in copy] == \
+                [row.to_dict() for row in self.rows]
+
+    def test_refuse_ragged_rows(self):
+        self.rows.append(model.Row([], [u'c'], 9))
+        try:
+            model.DataTable.from_rows(self.rows)
+            assert False, "Expected a ValueError"
+        except ValueError:
+            pass
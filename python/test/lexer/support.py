@@ -3,22 +3,27 @@ import unittest
 
 from nose import tools
 
-from gherkin.lexer.ext.lexer_en import Lexer
 from gherkin.sexp_recorder import SexpRecorder
 
 class LexerTest(unittest.TestCase):
     def setUp(self):
         self.listener = SexpRecorder()
-        self.lexer = Lexer(self.listener)
+        self.lexer = self.create_lexer()
+
+    def create_lexer(self, **options):
+        from gherkin.lexer.ext.lexer_en import Lexer
+        return Lexer(self.listener, **options)
 
     def scan(self, data):
         self.lexer.scan(data)
 
-    def scan_file(self, filename):
+    def fixture_path(self, filename):
         path = os.path.dirname(__file__)
-        filename = os.path.join(path, '..', '..', '..', 'spec', 'gherkin',
-                                'fixtures', filename)
-        self.lexer.scan(open(filename).read())
+        return os.path.join(path, '..', '..', '..', 'spec', 'gherkin',
+                            'fixtures', filename)
+
+    def scan_file(self, filename):
+        self.lexer.scan(open(self.fixture_path(filename)).read())
 
     def check(self, sexps):
         for have, expected in zip(self.listener.sexps, sexps):
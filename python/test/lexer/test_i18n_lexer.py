@@ -28,3 +28,11 @@ class TestI18nLexer(unittest.TestCase):
     def test_should_use_english_i18n_by_default(self):
         self.lexer.scan('Feature: foo\n')
         assert self.lexer.i18n_language.iso_code == 'en'
+
+    def test_reuse_the_lexer_while_the_language_is_the_same(self):
+        self.lexer.scan('Feature: foo\n')
+        scanner = self.lexer.scanner
+        self.lexer.scan('Feature: bar\n')
+        assert self.lexer.scanner is scanner
+        self.lexer.scan('# language: fr\nFonctionnalit\xc3\xa9: baz\n')
+        assert self.lexer.scanner is not scanner
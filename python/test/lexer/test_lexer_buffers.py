@@ -0,0 +1,97 @@
+# -*- coding: utf8 -*-
+
+import mmap
+import os
+import tempfile
+import unittest
+
+from nose import tools
+
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.sexp_recorder import SexpRecorder
+
+FEATURE = u"""# language: en
+Feature: Buffers
+  Scenario: Räksmörgås
+    Given a step
+      | a | b |
+    \"\"\"
+    text
+    \"\"\"
+    Then the end"""
+
+class TestBuffers(unittest.TestCase):
+    def setUp(self):
+        self.listener = SexpRecorder()
+        self.lexer = I18nLexer(self.listener)
+
+    def scan(self, data):
+        self.lexer.scan(data)
+
+    def sexps_for(self, source):
+        self.listener.sexps = []
+        self.lexer.scan(source)
+        return self.listener.sexps
+
+    def test_lex_buffers_like_strings(self):
+        data = FEATURE.encode('utf8')
+        expected = self.sexps_for(FEATURE)
+        tools.eq_(self.sexps_for(data), expected)
+        tools.eq_(self.sexps_for(bytearray(data)), expected)
+        tools.eq_(self.sexps_for(memoryview(data)), expected)
+        tools.eq_(self.sexps_for(buffer(data)), expected)
+
+    def test_lex_mmap(self):
+        data = FEATURE.encode('utf8')
+        expected = self.sexps_for(data)
+        source = mmap.mmap(-1, len(data))
+        source.write(data)
+        tools.eq_(self.sexps_for(source), expected)
+        source.close()
+
+    def test_last_token_ends_at_the_end_of_the_buffer(self):
+        self.scan(bytearray("Feature: Hi\n  Scenario: Yo\n    Given a"))
+        tools.eq_(self.listener.sexps, [
+            [u"feature", u"Feature", u"Hi", u"", 1],
+            [u"scenario", u"Scenario", u"Yo", u"", 2],
+            [u"step", u"Given ", u"a", 3],
+            [u"eof"],
+        ])
+
+    def test_report_lexing_errors_at_the_end_of_the_buffer(self):
+        try:
+            self.scan(bytearray("Feature: Hi\n  Scenario: Yo\n    Given a\n|| oh hello"))
+            assert False, "Expected a LexingError"
+        except LexingError, e:
+            tools.eq_(str(e), "Lexing error on line 4: '|| oh hello'. See http://wiki.github.com/cucumber/gherkin/lexingerror for more information.")
+
+    def test_tokenize_buffers(self):
+        data = FEATURE.encode('utf8')
+        tools.eq_(self.lexer.tokenize(memoryview(data)),
+                  self.lexer.tokenize(data))
+
+class TestScanFile(object):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.feature')
+        os.close(fd)
+        self.lexer = I18nLexer(SexpRecorder())
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+
+    def test_scan_file_detects_language(self):
+        self.write("# language: fr\nFonctionnalité: Hi\n")
+        self.lexer.scan_file(self.path)
+        tools.eq_(self.lexer.i18n_language.iso_code, 'fr')
+        tools.eq_(self.lexer.listener.sexps[1],
+                  [u"feature", u"Fonctionnalité", u"Hi", u"", 2])
+
+    def test_scan_empty_file(self):
+        self.write("")
+        self.lexer.scan_file(self.path)
+        tools.eq_(self.lexer.listener.sexps, [[u"eof"]])
@@ -0,0 +1,70 @@
+# -*- coding: utf8 -*-
+
+import glob
+import os.path
+import unittest
+
+from nose import tools
+
+from gherkin.lexer import ext as ext_lexer
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.sexp_recorder import SexpRecorder
+
+UNTERMINATED_DOC_STRING = u'''Feature: Docs
+  Scenario: Unterminated
+    Given a doc string
+      """
+      first line
+      Then not a step
+'''
+
+class TestLexerEquivalence(unittest.TestCase):
+    """The C lexers and the universal lexer report the same events for
+    the same source, errors included. The C lexer is created directly so
+    that a missing extension fails rather than falls back."""
+
+    def lex(self, lexer, listener, source):
+        try:
+            lexer.scan(source)
+        except LexingError as e:
+            return listener.sexps, str(e)
+        return listener.sexps, None
+
+    def lex_c(self, source):
+        listener = SexpRecorder()
+        i18n = I18nLexer(listener).lang(source)
+        lexer = ext_lexer.get_lexer(i18n.underscored_iso_code, listener)
+        return self.lex(lexer, listener, source)
+
+    def lex_universal(self, source):
+        listener = SexpRecorder()
+        lexer = I18nLexer(listener, force_universal=True)
+        return self.lex(lexer, listener, source)
+
+    def check(self, source):
+        tools.eq_(self.lex_c(source), self.lex_universal(source))
+
+    def fixtures(self):
+        path = os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                            'spec', 'gherkin', 'fixtures')
+        for filename in sorted(glob.glob(os.path.join(path, '*.feature'))):
+            with open(filename) as f:
+                yield f.read().decode('utf8')
+
+    def test_lex_the_fixtures_alike(self):
+        for source in self.fixtures():
+            self.check(source)
+
+    def test_lex_the_fixtures_with_crlf_line_endings_alike(self):
+        for source in self.fixtures():
+            self.check(source.replace(u'\r\n', u'\n').replace(u'\n', u'\r\n'))
+
+    def test_lex_the_fixtures_without_a_final_newline_alike(self):
+        for source in self.fixtures():
+            self.check(source.rstrip())
+
+    def test_lex_an_unterminated_doc_string_alike(self):
+        self.check(UNTERMINATED_DOC_STRING)
+        self.check(UNTERMINATED_DOC_STRING.replace(u'\n', u'\r\n'))
+        self.check(UNTERMINATED_DOC_STRING.rstrip())
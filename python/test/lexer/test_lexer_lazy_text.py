@@ -0,0 +1,62 @@
+# -*- coding: utf8 -*-
+
+from nose import tools
+
+from gherkin.lexer.universal import UniversalLexer
+from gherkin.lexer.views import DescriptionView, DocStringView
+from gherkin.sexp_recorder import SexpRecorder
+
+from .support import LexerTest
+
+FEATURE = u"""Feature: Lazy
+  In order to skip work
+  As a Räksmörgås
+    I want views
+
+  Scenario: Doc strings
+    Given a doc string
+      \"\"\"json
+      {
+        "quote": \\"\\"\\"
+      }
+      \"\"\"
+"""
+
+class TestLazyText(LexerTest):
+    def create_lexer(self, **options):
+        return UniversalLexer(self.listener, **options)
+
+    def lazy_sexps(self, source):
+        listener = SexpRecorder()
+        UniversalLexer(listener, lazy_text=True).scan(source)
+        return listener.sexps
+
+    def test_same_events_as_eager_lexing(self):
+        self.scan(FEATURE)
+        tools.eq_(self.lazy_sexps(FEATURE), self.listener.sexps)
+        data = FEATURE.encode('utf8')
+        tools.eq_(self.lazy_sexps(data), self.listener.sexps)
+        tools.eq_(self.lazy_sexps(bytearray(data)), self.listener.sexps)
+
+    def test_pass_views_to_the_listener(self):
+        class Listener(SexpRecorder):
+            def feature(self, keyword, name, description, line):
+                self.description = description
+
+            def doc_string(self, content_type, value, line):
+                self.value = value
+
+        listener = Listener()
+        UniversalLexer(listener, lazy_text=True).scan(FEATURE)
+        assert isinstance(listener.description, DescriptionView)
+        assert listener.description.source is FEATURE
+        assert isinstance(listener.value, DocStringView)
+        tools.eq_(listener.value.text(), u'{\n  "quote": """\n}')
+
+    def test_same_events_for_fixtures(self):
+        for name in ('complex.feature', 'dos_line_endings.feature'):
+            self.listener.sexps = []
+            self.scan_file(name)
+            path = self.fixture_path(name)
+            tools.eq_(self.lazy_sexps(open(path, 'rb').read()),
+                      self.listener.sexps)
@@ -0,0 +1,48 @@
+from nose import tools
+
+from .support import LexerTest
+
+DOC_STRING = u'''Feature: Docs
+  Scenario: Long doc string
+    Given a doc string
+      """
+      first line
+      "quoted" and | piped
+      # not a comment
+      Then not a step
+      \\"\\"\\"
+      last line
+      """
+    Then the end
+'''
+
+DESCRIPTION = u'''Feature: Descriptions
+  a plain line
+  another plain line
+    indented line
+
+  after a blank line
+  Scenario: After the description
+    Given a step
+'''
+
+class TestLineNumbers(LexerTest):
+    def test_keep_line_numbers_after_a_doc_string(self):
+        self.scan(DOC_STRING)
+        tools.eq_(self.listener.sexps[3:], [
+            [u"doc_string", u"", u'first line\n"quoted" and | piped\n'
+             u'# not a comment\nThen not a step\n"""\nlast line', 4],
+            [u"step", u"Then ", u"the end", 12],
+            [u"eof"],
+        ])
+
+    def test_keep_line_numbers_after_a_description(self):
+        self.scan(DESCRIPTION)
+        tools.eq_(self.listener.sexps, [
+            [u"feature", u"Feature", u"Descriptions",
+             u"a plain line\nanother plain line\n  indented line\n\n"
+             u"after a blank line", 1],
+            [u"scenario", u"Scenario", u"After the description", u"", 7],
+            [u"step", u"Given ", u"a step", 8],
+            [u"eof"],
+        ])
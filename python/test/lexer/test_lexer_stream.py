@@ -0,0 +1,107 @@
+# -*- coding: utf8 -*-
+
+from nose import tools
+
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.lexer.universal import UniversalLexer
+from gherkin.sexp_recorder import SexpRecorder
+
+from .support import LexerTest
+from .test_lexer_line_numbers import DESCRIPTION, DOC_STRING
+
+FEATURE = u"""@tag
+Feature: Streams
+  In order to lex big features
+  I want to feed them in chunks
+
+  Scenario: Räksmörgås
+    Given a table
+      | a | b \\| c |
+      | d | e |
+    And a doc string
+      \"\"\"
+      Räksmörgås
+      \"\"\"
+    # comment
+    Then the end
+"""
+
+class TestFeed(LexerTest):
+    def create_lexer(self, **options):
+        return UniversalLexer(self.listener, **options)
+
+    def feed(self, data, size):
+        for start in range(0, len(data), size):
+            self.lexer.feed(data[start:start + size])
+        self.lexer.close()
+        return self.listener.sexps
+
+    def test_feed_chunks_of_any_size(self):
+        self.scan(FEATURE)
+        expected = self.listener.sexps
+        data = FEATURE.encode('utf8')
+        for size in (1, 2, 3, 7, 64, len(data)):
+            self.listener.sexps = []
+            tools.eq_(self.feed(data, size), expected)
+
+    def test_keep_line_numbers_across_chunks(self):
+        for feature in (DOC_STRING, DESCRIPTION):
+            self.listener.sexps = []
+            self.scan(feature)
+            expected = self.listener.sexps
+            data = feature.encode('utf8')
+            for size in (1, 5, 16, 33):
+                self.listener.sexps = []
+                tools.eq_(self.feed(data, size), expected)
+
+    def test_emit_complete_tokens_before_close(self):
+        self.lexer.feed(u"Feature: Hi\n  Scenario: Yo\n    Given a\n    | a |\n")
+        tools.eq_(self.listener.sexps, [
+            [u"feature", u"Feature", u"Hi", u"", 1],
+            [u"scenario", u"Scenario", u"Yo", u"", 2],
+            [u"step", u"Given ", u"a", 3],
+            [u"row", [u"a"], 4],
+        ])
+        self.lexer.feed(u"    Then b\n")
+        self.lexer.close()
+        tools.eq_(self.listener.sexps[4:], [
+            [u"step", u"Then ", u"b", 5],
+            [u"eof"],
+        ])
+
+    def test_close_without_feed(self):
+        self.lexer.close()
+        tools.eq_(self.listener.sexps, [[u"eof"]])
+
+    def test_raise_lexing_errors_while_feeding(self):
+        self.lexer.feed(u"# ok\n")
+        with tools.assert_raises(LexingError):
+            self.lexer.feed(u"|| oh hello \n")
+        tools.eq_(self.listener.sexps[0], [u"comment", u"# ok", 1])
+
+        self.listener.sexps = []
+        self.lexer.feed(u"Feature: Again")
+        self.lexer.close()
+        tools.eq_(self.listener.sexps, [
+            [u"feature", u"Feature", u"Again", u"", 1],
+            [u"eof"],
+        ])
+
+    @tools.raises(RuntimeError)
+    def test_do_not_scan_while_feeding(self):
+        self.lexer.feed(u"Feature: Hi\n")
+        self.lexer.scan(u"Feature: Hi\n")
+
+class TestI18nFeed(object):
+    def test_detect_language_from_fed_chunks(self):
+        lexer = I18nLexer(SexpRecorder())
+        for chunk in ("# lang", "uage: fr\n", "Fonctionnalité: Hi\n"):
+            lexer.feed(chunk)
+        lexer.close()
+        tools.eq_(lexer.i18n_language.iso_code, 'fr')
+        tools.eq_(lexer.listener.sexps, [
+            [u"comment", u"# language: fr", 1],
+            [u"feature", u"Fonctionnalité", u"Hi", u"", 2],
+            [u"eof"],
+        ])
@@ -0,0 +1,68 @@
+# -*- coding: utf8 -*-
+
+from nose import tools
+
+from gherkin.lexer import tokens
+from gherkin.lexer.exceptions import LexingError
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.lexer.universal import UniversalLexer
+from gherkin.sexp_recorder import SexpRecorder
+
+from .support import LexerTest
+
+class TestTokenize(LexerTest):
+    def create_lexer(self, **options):
+        return UniversalLexer(self.listener, **options)
+
+    def tokenize(self, source):
+        data = source.encode('utf8')
+        return [(tokens.EVENTS[event], data[start:end].decode('utf8'), line)
+                for event, start, end, line in self.lexer.tokenize(source)]
+
+    def test_return_tokens_instead_of_calling_the_listener(self):
+        result = self.tokenize(u"# c\n@t\nFeature: Hi\n  Desc\n")
+        tools.eq_(result[:3], [
+            (u"comment", u"# c", 1),
+            (u"tag", u"@t", 2),
+            (u"feature", u"Feature: Hi\n  Desc", 3),
+        ])
+        tools.eq_(result[3][0], u"eof")
+        tools.eq_(self.listener.sexps, [])
+
+    def test_tokenize_steps_and_rows(self):
+        result = self.tokenize(u"Scenario: Yo\n  Given a\n    | a | \\| |\n")
+        tools.eq_(result[:5], [
+            (u"scenario", u"Scenario: Yo", 1),
+            (u"step", u"Given a", 2),
+            (u"row", u"| a | \\| |", 3),
+            (u"cell", u"a", 3),
+            (u"cell", u"\\|", 3),
+        ])
+
+    def test_tokenize_doc_strings(self):
+        result = self.tokenize(u'Given a\n"""\nhello\n"""\n')
+        tools.eq_(result[1], (u"doc_string", u"hello", 2))
+
+    def test_report_offsets_into_the_utf8_encoded_source(self):
+        result = self.tokenize(u"Given ůﻚ\n# ok\n")
+        tools.eq_(result[:2], [
+            (u"step", u"Given ůﻚ", 1),
+            (u"comment", u"# ok", 2),
+        ])
+
+    def test_end_with_an_eof_token(self):
+        source = u"Feature: Hi"
+        event, start, end, line = self.lexer.tokenize(source)[-1]
+        tools.eq_((event, start, end), (tokens.EOF, len(source), len(source)))
+
+    @tools.raises(LexingError)
+    def test_raise_lexing_errors(self):
+        self.lexer.tokenize(u"|| oh hello \n")
+
+class TestI18nTokenize(object):
+    def test_tokenize_features_in_any_language(self):
+        lexer = I18nLexer(SexpRecorder())
+        result = lexer.tokenize(u"# language: fr\nFonctionnalité: Hi\n")
+        tools.eq_([token[0] for token in result],
+                  [tokens.COMMENT, tokens.FEATURE, tokens.EOF])
+        tools.eq_(lexer.i18n_language.iso_code, 'fr')
@@ -0,0 +1,136 @@
+# -*- coding: utf8 -*-
+
+import unittest
+
+from nose import tools
+
+from gherkin.i18n import I18n
+from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.lexer.universal import KeywordTrie, UniversalLexer
+from gherkin.sexp_recorder import SexpRecorder
+
+from . import (test_lexer, test_lexer_doc_string, test_lexer_line_numbers,
+               test_lexer_rows, test_lexer_tags, test_lexer_windows)
+from .support import LexerTest
+
+class UniversalLexerTest(object):
+    def create_lexer(self, **options):
+        return UniversalLexer(self.listener, **options)
+
+class TestUniversalComments(UniversalLexerTest, test_lexer.TestComments):
+    pass
+
+class TestUniversalTags(UniversalLexerTest, test_lexer.TestTags):
+    pass
+
+class TestUniversalBackground(UniversalLexerTest, test_lexer.TestBackground):
+    pass
+
+class TestUniversalScenarios(UniversalLexerTest, test_lexer.TestScenarios):
+    pass
+
+class TestUniversalScenarioOutlines(UniversalLexerTest,
+                                    test_lexer.TestScenarioOutlines):
+    pass
+
+class TestUniversalExamples(UniversalLexerTest, test_lexer.TestExamples):
+    pass
+
+class TestUniversalSteps(UniversalLexerTest, test_lexer.TestSteps):
+    pass
+
+class TestUniversalMiscellaneous(UniversalLexerTest,
+                                 test_lexer.TestMiscellaneous):
+    pass
+
+class TestUniversalDocString(UniversalLexerTest,
+                             test_lexer_doc_string.TestDocString):
+    pass
+
+class TestUniversalRows(UniversalLexerTest, test_lexer_rows.TestRows):
+    pass
+
+class TestUniversalLineNumbers(UniversalLexerTest,
+                               test_lexer_line_numbers.TestLineNumbers):
+    pass
+
+class TestUniversalTagLines(UniversalLexerTest, test_lexer_tags.TestTags):
+    pass
+
+class TestUniversalBOM(UniversalLexerTest, test_lexer_windows.TestBOM):
+    pass
+
+class TestKeywordTrie(object):
+    def test_match_the_longest_keyword(self):
+        trie = KeywordTrie(I18n.get('fr'))
+        tools.eq_(trie.match(u"Etant données qqch"),
+                  ('step', u"Etant données "))
+        tools.eq_(trie.match(u"Etant donné qqch"), ('step', u"Etant donné "))
+        tools.eq_(trie.match(u"Plan du scénario: x"),
+                  ('scenario_outline', u"Plan du scénario"))
+
+    def test_match_heading_keywords_with_their_colon(self):
+        trie = KeywordTrie(I18n.get('en'))
+        tools.eq_(trie.match(u"Feature: x"), ('feature', u"Feature"))
+        tools.eq_(trie.match(u"Feature x"), None)
+
+class TestLanguages(UniversalLexerTest, LexerTest):
+    def test_detect_the_language_while_scanning(self):
+        self.scan(u"# hello\n\n#language:no\nEgenskap: Hi\n  Gitt a\n"
+                  u"  Scenario: Yo\n    Gitt b\n")
+        tools.eq_(self.lexer.i18n_language.iso_code, 'no')
+        tools.eq_(self.listener.sexps, [
+            [u"comment", u"# hello", 1],
+            [u"comment", u"#language:no", 3],
+            [u"feature", u"Egenskap", u"Hi", u"Gitt a", 4],
+            [u"scenario", u"Scenario", u"Yo", u"", 6],
+            [u"step", u"Gitt ", u"b", 7],
+            [u"eof"],
+        ])
+
+    def test_ignore_language_comments_after_the_header(self):
+        self.scan(u"Feature: Hi\n# language: fr\n")
+        tools.eq_(self.lexer.i18n_language.iso_code, 'en')
+
+    def test_scan_features_in_different_languages(self):
+        self.scan(u"# language: fr\nFonctionnalité: Un\n")
+        self.scan(u"Feature: Two\n")
+        tools.eq_(self.lexer.i18n_language.iso_code, 'en')
+        tools.eq_(self.listener.sexps[1], [u"feature", u"Fonctionnalité",
+                                           u"Un", u"", 2])
+        tools.eq_(self.listener.sexps[3], [u"feature", u"Feature", u"Two",
+                                           u"", 1])
+
+    def test_start_in_the_given_language(self):
+        self.lexer = UniversalLexer(self.listener, 'no')
+        self.scan(u"Egenskap: Hi\n")
+        tools.eq_(self.listener.sexps[0], [u"feature", u"Egenskap", u"Hi",
+                                           u"", 1])
+
+    def test_feed_chunks(self):
+        for chunk in ("# lang", "uage: fr\nFonctionnalit", "\xc3\xa9: Hi"):
+            self.lexer.feed(chunk)
+        self.lexer.close()
+        tools.eq_(self.listener.sexps, [
+            [u"comment", u"# language: fr", 1],
+            [u"feature", u"Fonctionnalité", u"Hi", u"", 2],
+            [u"eof"],
+        ])
+
+class TestForceUniversal(unittest.TestCase):
+    def test_share_one_universal_lexer(self):
+        lexer = I18nLexer(SexpRecorder(), force_universal=True)
+        lexer.scan(u"# language: fr\nFonctionnalité: Hi\n")
+        tools.eq_(lexer.i18n_language.iso_code, 'fr')
+        universal = lexer.universal
+        lexer.scan(u"# language: no\nEgenskap: Hi\n")
+        tools.eq_(lexer.i18n_language.iso_code, 'no')
+        assert lexer.universal is universal
+
+    def test_pass_options_to_the_universal_lexer(self):
+        listener = SexpRecorder()
+        lexer = I18nLexer(listener, force_universal=True, lazy_text=True)
+        lexer.scan(u"Feature: Hi\n  Desc\n")
+        tools.eq_(listener.sexps[0], [u"feature", u"Feature", u"Hi",
+                                      u"Desc", 1])
+        tools.eq_(lexer.tokenize(u"# c\n")[0], (0, 0, 3, 1))
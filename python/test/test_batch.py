@@ -0,0 +1,80 @@
+import json
+import os
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from nose import tools
+
+from gherkin import batch
+
+FEATURES = {
+    'a.feature': "Feature: a\n  Scenario: s\n    Given x\n",
+    'b/c.feature': "Feature: c\nFeature: c\n",
+    'b/d.feature': "Feature: d\n  Scenario: s\n    Given x\n      | a | b\n",
+    'b/e.feature': "@t\nFeature: e\n",
+    'b/notes.txt': "Not a feature\n",
+}
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for name, source in FEATURES.items():
+            path = os.path.join(self.path, name)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write(source)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def parse(self, **options):
+        paths = [os.path.join(self.path, 'b'),
+                 os.path.join(self.path, 'a.feature')]
+        return list(batch.parse_files(paths, **options))
+
+    def test_keep_the_input_order(self):
+        results = self.parse(processes=1)
+        tools.eq_([os.path.relpath(result['uri'], self.path)
+                   for result in results],
+                  ['b/c.feature', 'b/d.feature', 'b/e.feature', 'a.feature'])
+
+    def test_report_features_and_errors(self):
+        c, d, e, a = self.parse(processes=1)
+        tools.eq_(a['feature']['name'], u"a")
+        tools.eq_(a['feature']['elements'][0]['steps'][0]['name'], u"x")
+        tools.eq_(a['errors'], [])
+        tools.eq_(c['errors'][0]['event'], u"feature")
+        tools.eq_(c['errors'][0]['line'], 2)
+        assert 'Lexing error on line 4' in d['errors'][0]['message']
+        tools.eq_(e['feature']['tags'], [{'name': u"@t", 'line': 1}])
+        json.dumps([c, d, e, a])
+
+    def test_match_in_process_results_across_processes(self):
+        expected = self.parse(processes=1)
+        tools.eq_(self.parse(processes=2, chunksize=1), expected)
+        tools.eq_(self.parse(processes=2, chunksize=3), expected)
+
+    def test_merge_features_and_errors(self):
+        features, errors = batch.merge(self.parse(processes=1))
+        tools.eq_([feature['name'] for feature in features],
+                  [u"c", u"d", u"e", u"a"])
+        tools.eq_(len(errors), 2)
+
+    def test_report_files_that_cant_be_read_or_decoded(self):
+        latin1 = os.path.join(self.path, 'b', 'latin1.feature')
+        with open(latin1, 'w') as f:
+            f.write("Feature: caf\xe9\n")
+        missing = os.path.join(self.path, 'missing.feature')
+        a = os.path.join(self.path, 'a.feature')
+        for processes in (1, 2):
+            results = list(batch.parse_files([latin1, missing, a],
+                                             processes=processes))
+            tools.eq_([result['uri'] for result in results],
+                      [latin1, missing, a])
+            assert 'utf8' in results[0]['errors'][0]['message']
+            assert 'No such file' in results[1]['errors'][0]['message']
+            tools.eq_(results[2]['errors'], [])
+            tools.eq_(results[2]['feature']['name'], u"a")
@@ -0,0 +1,165 @@
+import os
+import os.path
+import shutil
+import tempfile
+import time
+import unittest
+
+from mock import Mock
+from nose import tools
+
+from gherkin import cache
+from gherkin.cache import ParseCache
+from gherkin.formatter import model
+from gherkin.parser import Parser, ParseError
+
+FEATURE = u'''# language: en
+@tagged
+Feature: Cached
+  A description
+
+  Scenario Outline: Outline
+    Given a <thing>
+      """
+      doc string
+      """
+    Examples:
+      | thing |
+      | one   |
+'''
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = ParseCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def parse(self, source, uri="f.feature", **options):
+        formatter = Mock()
+        parser = Parser(formatter, cache=self.cache, **options)
+        parser.parse(source, uri, 0)
+        return parser, formatter
+
+    def calls(self, formatter):
+        calls = []
+        for name, args, kwargs in formatter.method_calls:
+            calls.append((name, [arg.to_dict() if hasattr(arg, 'to_dict')
+                                 else arg for arg in args]))
+        return calls
+
+    def test_replay_without_lexing(self):
+        parser, formatter = self.parse(FEATURE)
+        expected = self.calls(formatter)
+
+        formatter = Mock()
+        parser = Parser(formatter, cache=self.cache)
+        parser.lexer = Mock()
+        parser.parse(FEATURE, "f.feature", 0)
+        tools.eq_(parser.lexer.scan.called, False)
+        tools.eq_(self.calls(formatter), expected)
+
+    def test_key_on_the_source_and_line_offset(self):
+        tools.eq_(self.cache.key(FEATURE),
+                  self.cache.key(FEATURE.encode('utf8')))
+        assert self.cache.key(FEATURE) != self.cache.key(FEATURE + u'\n')
+        assert self.cache.key(FEATURE) != self.cache.key(FEATURE, 1)
+
+    def test_keep_columnar_tables_apart(self):
+        self.parse(FEATURE)
+        parser, formatter = self.parse(FEATURE, columnar=True)
+        examples = formatter.examples.call_args[0][0]
+        assert isinstance(examples.rows, model.DataTable)
+        parser, formatter = self.parse(FEATURE)
+        examples = formatter.examples.call_args[0][0]
+        assert isinstance(examples.rows, list)
+
+    def test_lex_every_source_with_an_intern_pool(self):
+        self.parse(FEATURE)
+        pool = {}
+        parser, formatter = self.parse(FEATURE, pool=pool)
+        feature = formatter.feature.call_args[0][0]
+        assert feature.name is pool[u'Cached']
+
+    def test_key_on_the_fingerprint(self):
+        key = self.cache.key(FEATURE)
+        original = cache.FORMAT
+        cache.FORMAT = 'test'
+        try:
+            assert ParseCache(self.path).key(FEATURE) != key
+        finally:
+            cache.FORMAT = original
+
+    def test_key_on_the_gherkin_version(self):
+        key = self.cache.key(FEATURE)
+        original = cache.__version__
+        cache.__version__ = '0.0'
+        try:
+            assert ParseCache(self.path).key(FEATURE) != key
+        finally:
+            cache.__version__ = original
+
+    def test_replay_syntax_errors_at_the_new_uri(self):
+        source = u"Feature: f\nFeature: f\n"
+        self.parse(source, raise_on_error=False)
+        parser, formatter = self.parse(source, "g.feature",
+                                       raise_on_error=False)
+        formatter.syntax_error.assert_called_with(
+            'feature', u'feature', [u'background', u'comment', u'scenario',
+                                    u'scenario_outline', u'tag'],
+            "g.feature", 2)
+        with tools.assert_raises(ParseError):
+            self.parse(source)
+
+    def test_do_not_store_sources_that_raised(self):
+        with tools.assert_raises(ParseError):
+            self.parse(u"Feature: f\nFeature: f\n")
+        tools.eq_(os.listdir(self.path), [])
+
+    def test_treat_a_corrupt_entry_as_missing(self):
+        key = self.cache.key(FEATURE)
+        with open(self.cache.entry(key), 'wb') as f:
+            f.write('garbage')
+        tools.eq_(self.cache.get(key), None)
+        self.parse(FEATURE)
+        assert self.cache.get(key) is not None
+
+    def test_treat_an_entry_of_older_models_as_missing(self):
+        key = self.cache.key(FEATURE)
+        with open(self.cache.entry(key), 'wb') as f:
+            f.write('cgherkin.formatter.model\nRemovedModel\n.')
+        tools.eq_(self.cache.get(key), None)
+        tools.eq_(os.listdir(self.path), [])
+
+    def test_evict_the_least_recently_used(self):
+        sources = [u"Feature: f%d\n" % i for i in range(4)]
+        for source in sources:
+            self.parse(source)
+        size = os.path.getsize(self.cache.entry(self.cache.key(sources[0])))
+        # Make the entries' ages distinct, then use the oldest
+        for i, source in enumerate(sources):
+            stamp = time.time() - 100 + i
+            os.utime(self.cache.entry(self.cache.key(source)), (stamp, stamp))
+        self.cache.get(self.cache.key(sources[0]))
+
+        self.cache = ParseCache(self.path, max_size=size * 4)
+        self.parse(u"Feature: f4\n")
+        kept = [source for source in sources
+                if os.path.exists(self.cache.entry(self.cache.key(source)))]
+        tools.eq_(kept, [sources[0], sources[3]])
+        tools.eq_([name for name in os.listdir(self.path)
+                   if name.endswith('.tmp')], [])
+
+    def test_count_what_other_processes_put(self):
+        source = u"Feature: f\n"
+        self.parse(source)
+        size = os.path.getsize(self.cache.entry(self.cache.key(source)))
+        self.cache = ParseCache(self.path, max_size=size * 5)
+        self.parse(u"Feature: g\n")
+        other = ParseCache(self.path)
+        for i in range(10):
+            key = other.key(u"Feature: o%d\n" % i)
+            other.put(key, other.get(self.cache.key(source)))
+        self.parse(u"Feature: h\n")
+        assert self.cache.scan_size() <= size * 5
@@ -0,0 +1,79 @@
+from nose import tools
+import unittest
+
+from gherkin.compile import Pickle, PickleStep, PickleString, pickles
+
+FEATURE = u'''@feature
+Feature: Compile
+  Background:
+    Given a background
+      | a | b |
+
+  @scenario @feature
+  Scenario: Plain
+    Given a step
+      """text
+      Hello
+      """
+
+  @outline
+  Scenario Outline: Eat <food>
+    Given I have <food>
+      | <food> |
+
+    @small
+    Examples: Small
+      | food   |
+      | apples |
+      | pears  |
+
+    Examples: Big
+      | food  |
+      | melon |
+'''
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        self.pickles = pickles(FEATURE, 'f.feature')
+        self.background = PickleStep(u'Given ', u'a background', (4,),
+                                     ((u'a', u'b'),), None)
+
+    def test_compile_a_scenario(self):
+        tools.eq_(self.pickles[0], Pickle(
+            'f.feature', u'Plain', (8,), (u'@feature', u'@scenario'),
+            (self.background,
+             PickleStep(u'Given ', u'a step', (9,), None,
+                        PickleString(u'text', u'Hello', 10)))))
+
+    def test_compile_an_outline(self):
+        tools.eq_(self.pickles[1:], [
+            Pickle('f.feature', u'Eat apples', (15, 22),
+                   (u'@feature', u'@outline', u'@small'),
+                   (self.background,
+                    PickleStep(u'Given ', u'I have apples', (16, 22),
+                               ((u'apples',),), None))),
+            Pickle('f.feature', u'Eat pears', (15, 23),
+                   (u'@feature', u'@outline', u'@small'),
+                   (self.background,
+                    PickleStep(u'Given ', u'I have pears', (16, 23),
+                               ((u'pears',),), None))),
+            Pickle('f.feature', u'Eat melon', (15, 27),
+                   (u'@feature', u'@outline'),
+                   (self.background,
+                    PickleStep(u'Given ', u'I have melon', (16, 27),
+                               ((u'melon',),), None)))])
+
+    def test_share_the_background_steps(self):
+        backgrounds = set(id(pickle.steps[0]) for pickle in self.pickles)
+        tools.eq_(len(backgrounds), 1)
+
+    def test_compile_columnar_tables(self):
+        tools.eq_(pickles(FEATURE, 'f.feature', columnar=True), self.pickles)
+
+    def test_start_each_feature_afresh(self):
+        compiled = pickles(u'Feature: No background\n'
+                           u'  Scenario: Alone\n'
+                           u'    Given a step\n', 'g.feature')
+        tools.eq_(compiled, [Pickle('g.feature', u'Alone', (2,), (),
+                                    (PickleStep(u'Given ', u'a step', (3,),
+                                                None, None),))])
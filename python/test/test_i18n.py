@@ -1,12 +1,17 @@
 # -*- coding: utf8 -*-
 
 import os.path
+import shutil
+import sys
+import tempfile
 import unittest
 
 from nose import tools
 
+from gherkin import i18n
 from gherkin.i18n import I18n
 from gherkin.lexer.i18n_lexer import I18nLexer
+from gherkin.lexer.universal import UniversalLexer
 from gherkin.sexp_recorder import SexpRecorder
 
 # XXX: CONTAINS UNPORTED TESTS
@@ -85,6 +90,21 @@ class TestI18n(unittest.TestCase):
         for code_keyword in code_keywords:
             assert code_keyword in I18n.all_code_keywords()
 
+    def test_keep_keywords_apart_from_step_and_code_keywords(self):
+        i18n = I18n('en')
+        i18n.step_keywords()
+        i18n.code_keywords()
+        for key in ('step', 'code'):
+            with tools.assert_raises(KeyError):
+                i18n.keywords(key)
+        tools.eq_(i18n.keywords('given'), (u'* ', u'Given '))
+
+    def test_give_lexer_options_to_the_universal_lexer(self):
+        lexer = I18n.get('fr').lexer(self.listener, lazy_text=True)
+        assert isinstance(lexer, UniversalLexer)
+        tools.eq_(lexer.iso_code, 'fr')
+        assert lexer.lazy_text
+
     def test_reject_bullet_stars(self):
         assert '*' not in I18n.all_code_keywords()
 
@@ -92,6 +112,25 @@ class TestI18n(unittest.TestCase):
         expected_substring = '|Quando |Quand |Quan |Pryd |Pokud |'
         assert expected_substring in I18n.keyword_regexp('step')
 
+    def test_index_keywords_across_languages(self):
+        index = I18n.keyword_index()
+        assert ('fr', 'given') in index[u'Etant donné ']
+        assert ('en', 'feature') in index[u'Feature']
+        assert index is I18n.keyword_index()
+
+    def test_compile_the_keyword_regexp_once(self):
+        pattern = I18n.keyword_pattern('step')
+        tools.eq_(pattern.match(u'Etant données x').group(), u'Etant données ')
+        tools.eq_(pattern.match(u'* x').group(), u'* ')
+        assert pattern is I18n.keyword_pattern('step')
+
+    def test_share_keyword_tuples(self):
+        i18n = I18n.get('fr')
+        tools.eq_(i18n.keywords('when'), (u'* ', u'Quand ', u'Lorsque ',
+                                          u"Lorsqu'"))
+        assert i18n.keywords('when') is i18n.keywords('when')
+        assert I18n.all() is I18n.all()
+
     def test_print_available_languages(self):
         assert u"\n" + I18n.language_table() == u"""
       | ar        | Arabic              | العربية           |
@@ -160,5 +199,38 @@ class TestI18n(unittest.TestCase):
       | but (code)       | "Mais"                                                                                                                                                |
 """
 
+class TestLanguages(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        sys.modules.pop('compiled_i18n', None)
+        shutil.rmtree(self.path)
+
+    def languages(self):
+        return i18n.Languages(os.path.join(i18n.here, 'i18n.yml'),
+                              'compiled_i18n')
+
+    def test_load_compiled_languages_like_the_yaml(self):
+        i18n.compile_languages(target=os.path.join(self.path,
+                                                   'compiled_i18n.py'))
+        compiled = self.languages()
+        tools.eq_(sorted(compiled), sorted(i18n.read_yaml(compiled.path)))
+        tools.eq_(compiled['fr'], i18n.read_yaml(compiled.path)['fr'])
+
+    def test_unmarshal_languages_when_they_are_first_used(self):
+        i18n.compile_languages(target=os.path.join(self.path,
+                                                   'compiled_i18n.py'))
+        compiled = self.languages()
+        compiled['no']
+        tools.eq_(compiled.loaded.keys(), ['no'])
+
+    def test_read_the_yaml_without_a_compiled_module(self):
+        languages = self.languages()
+        tools.eq_(languages['en']['feature'], u'Feature')
+        assert u'fr' in languages
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,160 @@
+import random
+import unittest
+
+from mock import Mock
+from nose import tools
+
+from gherkin.incremental import Document
+from gherkin.lexer.exceptions import LexingError
+from gherkin.parser import Parser, ParseError
+
+FEATURE = u'''# language: en
+@feature
+Feature: Edited
+  Some description
+
+  Background:
+    Given a background
+
+  # A comment
+  @one
+  Scenario: One
+    Given a step
+      | a | b |
+      | c | d |
+
+  Scenario Outline: Two
+    Given a <thing>
+      """
+      doc string
+      """
+
+    @examples
+    Examples:
+      | thing |
+      | x     |
+
+  Scenario: Three
+    Given a step
+    Then another
+'''
+
+# Lines that random edits are made of
+EDIT_LINES = [
+    u'',
+    u'  # A comment',
+    u'  @tag',
+    u'  Scenario: Random',
+    u'  Scenario Outline: Random',
+    u'  Background:',
+    u'    Examples:',
+    u'    Given a random step',
+    u'    Then a <thing>',
+    u'      | a | b |',
+    u'      | thing |',
+    u'      """',
+    u'  Some description',
+]
+
+def calls(formatter):
+    return [(name, [arg.to_dict() if hasattr(arg, 'to_dict') else arg
+                    for arg in args])
+            for name, args, kwargs in formatter.method_calls]
+
+class TestDocument(unittest.TestCase):
+    def setUp(self):
+        self.document = Document(FEATURE, "f.feature")
+
+    def assert_parsed(self):
+        expected = Mock()
+        Parser(expected).parse(self.document.source, "f.feature", 0)
+        replayed = Mock()
+        self.document.replay(replayed)
+        tools.eq_(calls(replayed), calls(expected))
+
+    def edit(self, first, last, text):
+        # Reparsing the whole feature would be correct too, so make sure it
+        # doesn't happen
+        parse = self.document.parse
+        self.document.parse = Mock()
+        self.document.edit(first, last, text)
+        tools.eq_(self.document.parse.called, False)
+        self.document.parse = parse
+        self.assert_parsed()
+
+    def test_parse_the_whole_feature(self):
+        self.assert_parsed()
+        tools.eq_([element.start for element in self.document.elements],
+                  [1, 6, 9, 16, 27])
+
+    def test_edit_a_step(self):
+        self.edit(12, 12, u"    Given an edited step")
+
+    def test_move_the_elements_after_an_edit(self):
+        self.edit(12, 12, u"    Given a\n    And more\n    And more")
+        tools.eq_([element.start for element in self.document.elements],
+                  [1, 6, 9, 18, 29])
+        self.edit(7, 7, u"")
+        self.edit(30, 30, u"    Then nothing")
+
+    def test_edit_across_elements(self):
+        self.edit(13, 25, u"  Scenario: Merged\n    Given it")
+        self.edit(3, 7, u"Feature: Shorter")
+
+    def test_split_an_element(self):
+        self.edit(14, 14, u"      | c | d |\n  Scenario: New\n    Given new")
+        tools.eq_(len(self.document.elements), 6)
+
+    def test_insert_and_delete_lines(self):
+        self.edit(27, 26, u"  @new")
+        self.edit(16, 25, u"")
+        tools.eq_(len(self.document.elements), 4)
+
+    def test_edit_the_header(self):
+        self.edit(4, 4, u"  Another description")
+
+    def test_reparse_everything_when_an_element_does_not_stand_alone(self):
+        # Without their scenario, the steps go to the background
+        self.document.edit(9, 11, u"")
+        self.assert_parsed()
+        tools.eq_(len(self.document.elements), 4)
+
+    def test_reparse_everything_when_the_language_changes(self):
+        self.document.parse = Mock()
+        self.document.edit(1, 1, u"# language: fr")
+        tools.eq_(self.document.parse.called, True)
+
+    def test_raise_when_the_feature_does_not_parse(self):
+        with tools.assert_raises(ParseError):
+            self.document.edit(3, 3, u"Feature: Edited\nFeature: Twice")
+        self.document.edit(3, 4, u"Feature: Edited")
+        self.assert_parsed()
+
+    def test_give_trailing_comments_to_the_next_element(self):
+        self.document.edit(14, 14, u"      # | c | d |")
+        self.assert_parsed()
+
+    def test_reparse_an_element_without_steps_with_the_next_one(self):
+        self.document.edit(15, 14, u"  Scenario Outline: O")
+        self.assert_parsed()
+        self.document.edit(15, 15, u"  Scenario: S")
+        self.assert_parsed()
+
+    def test_replay_random_edits_like_a_full_parse(self):
+        generator = random.Random(1)
+        for n in range(500):
+            lines = self.document.lines
+            first = generator.randint(1, len(lines))
+            last = generator.randint(first - 1, min(first + 3, len(lines)))
+            text = u'\n'.join(generator.sample(EDIT_LINES,
+                                                generator.randint(1, 3)))
+            source = u'\n'.join(lines[:first - 1] + [text] + lines[last:])
+            try:
+                Parser(Mock()).parse(source, "f.feature", 0)
+            except (ParseError, LexingError):
+                with tools.assert_raises((ParseError, LexingError)):
+                    self.document.edit(first, last, text)
+                self.document = Document(FEATURE, "f.feature")
+            else:
+                self.document.edit(first, last, text)
+                self.assert_parsed()
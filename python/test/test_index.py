@@ -0,0 +1,151 @@
+import os
+import os.path
+import re
+import shutil
+import tempfile
+import unittest
+
+from nose import tools
+
+from gherkin.index import Index
+
+FEATURES = {
+    'a.feature': u'''@fast
+Feature: Alpha
+
+  Background:
+    Given a background
+
+  @wip
+  Scenario: First
+    Given a step
+    Then another
+
+  Scenario Outline: Second
+    Given <x>
+
+    @slow
+    Examples: Table
+      | x |
+      | 1 |
+      | 2 |
+''',
+    'b/c.feature': u'''Feature: Gamma
+  @wip @slow
+  Scenario: Third
+    Given a step
+''',
+    'b/broken.feature': u'''Feature: Broken
+Feature: Twice
+''',
+}
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for name, source in FEATURES.items():
+            self.write(name, source)
+        self.index = Index(':memory:')
+        self.errors = self.index.update([self.path])
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.path)
+
+    def write(self, name, source):
+        path = os.path.join(self.path, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write(source.encode('utf8'))
+
+    def uri(self, name):
+        return os.path.join(self.path, name).decode('utf8')
+
+    def names(self, elements):
+        return [element.name for element in elements]
+
+    def test_record_elements_with_their_line_ranges(self):
+        tools.eq_([(e.type, e.feature_name, e.name, e.first_line, e.last_line)
+                   for e in self.index.lines(self.uri('a.feature'),
+                                             range(1, 20))], [
+            ('background', u'Alpha', u'', 4, 5),
+            ('scenario', u'Alpha', u'First', 7, 10),
+            ('scenario_outline', u'Alpha', u'Second', 12, 13),
+            ('examples', u'Alpha', u'Table', 15, 19),
+        ])
+
+    def test_report_files_that_do_not_parse(self):
+        tools.eq_([uri for uri, error in self.errors],
+                  [self.uri('b/broken.feature')])
+
+    def test_find_elements_by_tag_expression(self):
+        tools.eq_(self.names(self.index.tagged(['@wip'])),
+                  [u'First', u'Third'])
+        tools.eq_(self.names(self.index.tagged(['@fast', '@slow'])),
+                  [u'Table'])
+        tools.eq_(self.names(self.index.tagged(['@fast,@slow', '~@wip'])),
+                  [u'', u'Second', u'Table'])
+        tools.eq_(self.names(self.index.tagged(['~@wip,~@slow'])),
+                  [u'', u'First', u'Second', u'Table'])
+        tools.eq_(len(self.index.tagged([])), 5)
+
+    def test_find_elements_by_line(self):
+        tools.eq_(self.names(self.index.lines(self.uri('a.feature'), [9, 17])),
+                  [u'First', u'Table'])
+        tools.eq_(self.index.lines(self.uri('a.feature'), [2]), [])
+
+    def test_find_elements_by_thousands_of_lines(self):
+        tools.eq_(self.names(self.index.lines(self.uri('a.feature'),
+                                              range(9, 5000))),
+                  [u'First', u'Second', u'Table'])
+
+    def test_find_elements_by_name(self):
+        tools.eq_(self.names(self.index.named(['^Th'])), [u'Third'])
+        tools.eq_(self.names(self.index.named([re.compile('amm')])),
+                  [u'Third'])
+
+    def test_update_only_changed_files(self):
+        self.write('b/c.feature', u'Feature: Gamma\n  Scenario: Fourth\n'
+                   u'    Given it\n')
+        os.remove(os.path.join(self.path, 'b', 'broken.feature'))
+        tools.eq_(self.index.update([self.path]), [])
+        tools.eq_(self.names(self.index.tagged(['@wip'])), [u'First'])
+        tools.eq_(self.names(self.index.named(['^F'])), [u'First', u'Fourth'])
+        tools.eq_(self.index.db.execute('SELECT COUNT(*) FROM files')
+                  .fetchone()[0], 2)
+
+    def test_keep_the_index_on_disk(self):
+        path = os.path.join(self.path, 'index.db')
+        index = Index(path)
+        index.update([self.path])
+        index.close()
+        index = Index(path)
+        tools.eq_(self.names(index.tagged(['@slow'])), [u'Table', u'Third'])
+        tools.eq_(index.update([self.path]), [])
+        index.close()
+
+    def test_index_a_file_found_twice_once(self):
+        index = Index(':memory:')
+        a = os.path.join(self.path, 'a.feature')
+        index.update([self.path, a, os.path.join(self.path, '.', 'b', '..',
+                                                 'a.feature')])
+        tools.eq_(index.db.execute('SELECT uri FROM files WHERE uri = ?',
+                                   (a,)).fetchall(), [(a,)])
+        index.close()
+
+    def test_keep_files_by_absolute_path(self):
+        cwd = os.getcwd()
+        os.chdir(self.path)
+        try:
+            tools.eq_(self.index.update(['.']), [])
+            tools.eq_(self.index.db.execute('SELECT COUNT(*) FROM files')
+                      .fetchone()[0], 3)
+            tools.eq_(self.names(self.index.lines('a.feature', [9])),
+                      [u'First'])
+            tools.eq_(self.names(self.index.lines(
+                os.path.join('b', '..', 'a.feature'), [9])), [u'First'])
+        finally:
+            os.chdir(cwd)
+        tools.eq_(self.names(self.index.lines(self.uri('a.feature'), [9])),
+                  [u'First'])
@@ -0,0 +1,101 @@
+from mock import Mock
+from nose import tools
+import unittest
+
+from gherkin.formatter import model
+from gherkin.outline import Outline, OutlineExpander, Template
+from gherkin.parser import Parser
+
+FEATURE = u'''Feature: Outlines
+  @outline
+  Scenario Outline: Eat <food>
+    Given I have <count> <food>
+      | food   | count   |
+      | <food> | <count> |
+    When I eat <eaten>
+      """
+      <food> was <missing> and <eaten>
+      """
+
+    @small
+    Examples: Small
+      | food   | count | eaten |
+      | apples | 3     | 1     |
+      | pears  | 2     | 2     |
+
+    Examples: Empty
+      | food |
+
+  Scenario: Plain
+    Given <nothing>
+'''
+
+class TestTemplate(unittest.TestCase):
+    def test_render_the_placeholders_in_the_header(self):
+        template = Template(u'<a> and <b> but not <c>')
+        slots = template.compile([u'b', u'a'])
+        tools.eq_(template.render([u'B', u'A'], slots),
+                  u'A and B but not <c>')
+
+    def test_find_the_arguments(self):
+        arguments = Template(u'I have <number> cukes in <whose> belly') \
+            .arguments()
+        tools.eq_([(a.offset, a.val) for a in arguments],
+                  [(7, u'<number>'), (25, u'<whose>')])
+
+class TestOutline(unittest.TestCase):
+    def parse(self, **options):
+        formatter = Mock()
+        Parser(formatter, **options).parse(FEATURE, "f.feature", 0)
+        outline = formatter.scenario_outline.call_args[0][0]
+        steps = [call[0][0] for call in formatter.step.call_args_list[:2]]
+        examples = [call[0][0] for call in formatter.examples.call_args_list]
+        return Outline(outline, steps, examples)
+
+    def test_expand_every_examples_row(self):
+        scenarios = list(self.parse().scenarios())
+        tools.eq_([(examples.name, scenario.name, scenario.line,
+                    [tag.name for tag in scenario.tags])
+                   for examples, scenario, steps in scenarios],
+                  [(u'Small', u'Eat apples', 15, [u'@outline', u'@small']),
+                   (u'Small', u'Eat pears', 16, [u'@outline', u'@small'])])
+        given, when = scenarios[0][2]
+        tools.eq_(given.name, u'I have 3 apples')
+        tools.eq_([row.cells for row in given.rows],
+                  [[u'food', u'count'], [u'apples', u'3']])
+        tools.eq_(given.rows[1].line, 6)
+        tools.eq_(when.name, u'I eat 1')
+        tools.eq_(when.doc_string.value, u'apples was <missing> and 1')
+        tools.eq_(when.line, 7)
+
+    def test_expand_columnar_examples(self):
+        expected = [(scenario.to_dict(), [step.to_dict() for step in steps])
+                    for examples, scenario, steps in self.parse().scenarios()]
+        scenarios = self.parse(columnar=True).scenarios()
+        tools.eq_([(scenario.to_dict(), [step.to_dict() for step in steps])
+                   for examples, scenario, steps in scenarios], expected)
+
+    def test_expand_one_row_at_a_time(self):
+        rows = [model.Row([], [u'x'], 1)]
+        rows.extend(model.Row([], [unicode(i)], i + 2) for i in range(10000))
+        outline = model.ScenarioOutline([], [], u'Scenario Outline', u'<x>',
+                                        u'', 1)
+        examples = model.Examples([], [], u'Examples', u'', u'', 1, rows)
+        scenarios = Outline(outline, [], [examples]).scenarios()
+        tools.eq_(scenarios.next()[1].name, u'0')
+        tools.eq_(scenarios.next()[1].name, u'1')
+
+class TestOutlineExpander(unittest.TestCase):
+    def test_replace_outlines_with_their_scenarios(self):
+        formatter = Mock()
+        Parser(OutlineExpander(formatter)).parse(FEATURE, "f.feature", 0)
+        tools.eq_(formatter.feature.call_count, 1)
+        tools.eq_(formatter.scenario_outline.call_count, 0)
+        tools.eq_(formatter.examples.call_count, 0)
+        scenarios = formatter.scenario.call_args_list
+        tools.eq_([call[0][0].name for call in scenarios],
+                  [u'Eat apples', u'Eat pears', u'Plain'])
+        tools.eq_([call[0][0].name for call in formatter.step.call_args_list],
+                  [u'I have 3 apples', u'I eat 1', u'I have 2 pears',
+                   u'I eat 2', u'<nothing>'])
+        tools.eq_(formatter.eof.call_count, 1)
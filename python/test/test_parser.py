@@ -1,12 +1,22 @@
 # -*- coding: utf8 -*-
 
 import inspect
+import json
+import os.path
+import shutil
+import tempfile
 import unittest
 
+from cStringIO import StringIO
+
 from mock import Mock
 from nose import tools
 
+from gherkin import parser
+from gherkin.formatter.json_formatter import JSONFormatter
+from gherkin.formatter.model import DataTable
 from gherkin.formatter.pretty_formatter import PrettyFormatter
+from gherkin.lexer.exceptions import LexingError
 from gherkin.parser import Parser, ParseError
 
 class TestParser(unittest.TestCase):
@@ -15,3 +25,123 @@ class TestParser(unittest.TestCase):
         with tools.assert_raises(ParseError):
             p.parse(u"Feature: f\nFeature: f", __file__,
                     inspect.currentframe().f_back.f_lineno - 1)
+
+    def test_report_the_state_and_the_expected_events(self):
+        p = Parser(Mock(PrettyFormatter))
+        try:
+            p.parse(u"# c\nFeature: f\n  @t\n  Given a", "f.feature", 0)
+            assert False, "Expected a ParseError"
+        except ParseError, e:
+            tools.eq_(e.args, ('tag', 'step', [u'examples', u'feature',
+                                               u'scenario', u'scenario_outline',
+                                               u'tag'], "f.feature", 4))
+
+    def test_report_syntax_errors_to_the_formatter(self):
+        formatter = Mock()
+        p = Parser(formatter, raise_on_error=False)
+        p.parse(u"Feature: f\nFeature: f", "f.feature", 0)
+        formatter.syntax_error.assert_called_with(
+            'feature', u'feature', [u'background', u'comment', u'scenario',
+                                    u'scenario_outline', u'tag'],
+            "f.feature", 2)
+
+    def test_return_to_the_root_machine_after_comments_and_tags(self):
+        p = Parser(Mock(PrettyFormatter))
+        p.parse(u"# c\n@t\nFeature: f\n  # c\n  @t @u\n  Scenario: s\n"
+                u"    # c\n    Given a\n", "f.feature", 0)
+        tools.eq_(p.machines, [parser.MACHINE_IDS['root']])
+        tools.eq_(p.state, 'root')
+
+class TestParseMany(unittest.TestCase):
+    def test_yield_each_document_with_its_error(self):
+        formatter = Mock()
+        p = Parser(formatter)
+        results = list(p.parse_many([
+            (u"Feature: a\n  Scenario: s\n    Given x\n", "a.feature"),
+            (u"Feature: b\nFeature: b\n", "b.feature"),
+            (u"Feature: c\n  Scenario: s\n    Given x\n      | a | b\n",
+             "c.feature"),
+            (u"@t\nFeature: d\n", "d.feature"),
+        ]))
+        tools.eq_([uri for uri, error in results],
+                  ["a.feature", "b.feature", "c.feature", "d.feature"])
+        tools.eq_(results[0][1], None)
+        assert isinstance(results[1][1], ParseError)
+        assert isinstance(results[2][1], LexingError)
+        tools.eq_(results[3][1], None)
+        tools.eq_(formatter.eof.call_count, 2)
+
+    def test_start_each_document_afresh(self):
+        formatter = Mock()
+        p = Parser(formatter)
+        results = list(p.parse_many([
+            (u"# c\n@t\nFeature: a\n  @u\n  Scenario: s\n    Given x\n"
+             u"  Scenario: s\n    Given @y", "a.feature"),
+            (u"Feature: b\n", "b.feature"),
+        ]))
+        tools.eq_(results[1], ("b.feature", None))
+        feature = formatter.feature.call_args[0][0]
+        tools.eq_(feature.comments, [])
+        tools.eq_(feature.tags, [])
+
+    def test_add_the_line_offset_to_errors(self):
+        p = Parser(Mock())
+        [(uri, error)] = p.parse_many([(u"Feature: f\nFeature: f",
+                                        "f.feature")], line_offset=10)
+        tools.eq_(error.args[-1], 12)
+
+class TestColumnar(unittest.TestCase):
+    source = (u"Feature: f\n  Scenario Outline: s\n    Given a\n"
+              u"      | x | y |\n      # c\n      | 1 | 2 |\n"
+              u"    Given <x>\n    Examples: e\n      | x |\n      | 1 |\n"
+              u"      | 2 |\n    Examples: ragged\n      | x |\n"
+              u"      | 1 | 2 |\n")
+
+    def parse(self, **options):
+        io = StringIO()
+        Parser(JSONFormatter(io), **options).parse(self.source, "f.feature", 0)
+        return json.loads(io.getvalue())
+
+    def test_produce_the_same_output_as_rows(self):
+        tools.eq_(self.parse(columnar=True), self.parse())
+
+    def test_keep_tables_as_columns(self):
+        formatter = Mock()
+        Parser(formatter, columnar=True).parse(self.source, "f.feature", 0)
+        step = formatter.step.call_args_list[0][0][0]
+        assert isinstance(step.rows, DataTable)
+        examples = [call[0][0] for call in formatter.examples.call_args_list]
+        assert isinstance(examples[0].rows, DataTable)
+        assert isinstance(examples[1].rows, list)
+
+class TestInternPool(unittest.TestCase):
+    def test_share_strings_across_parsers(self):
+        pool = {}
+        formatters = [Mock(), Mock()]
+        for formatter in formatters:
+            Parser(formatter, pool=pool).parse(
+                u"@smoke\nFeature: f\n  Scenario: s\n    Given a step\n"
+                u"      | cell |\n", "f.feature", 0)
+        features, steps = [], []
+        for formatter in formatters:
+            features.append(formatter.feature.call_args[0][0])
+            steps.append(formatter.step.call_args[0][0])
+        assert features[0].tags[0].name is features[1].tags[0].name
+        assert features[0].keyword is features[1].keyword
+        assert steps[0].keyword is steps[1].keyword
+        assert steps[0].name is steps[1].name
+        assert steps[0].rows[0].cells[0] is steps[1].rows[0].cells[0]
+        assert pool[u"Given "] is steps[0].keyword
+
+class TestTables(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_generated_tables_match_the_parser_data(self):
+        target = os.path.join(self.path, 'parser_tables.py')
+        parser.compile_tables(target)
+        source = os.path.join(parser.here, 'parser_tables.py')
+        tools.eq_(open(target).read(), open(source).read())
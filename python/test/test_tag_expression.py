@@ -93,4 +93,16 @@ class TestTagExpressionTagLimits(unittest.TestCase):
     def test_should_allow_duplicate_consistent_limits(self):
         e = TagExpression(['@todo:3', '~@todo:3'])
         tools.eq_(e.limits, {'@todo': 3})
-        
\ No newline at end of file
+        
+class TestTagExpressionEvalMany(unittest.TestCase):
+    def test_should_eval_each_tag_list(self):
+        e = TagExpression(['@foo,@bar', '~@zap,~@wip'])
+        tag_lists = [['@foo'], ['@bar', '@zap'], ['@foo', '@zap', '@wip'],
+                     ['@other'], [], ['@bar', '@other', '@wip'],
+                     ['@foo', '@wip', '@zap']]
+        tools.eq_(e.eval_many(tag_lists),
+                  [True, True, False, False, False, True, False])
+        tools.eq_(e.eval_many(tag_lists), [e.eval(tags) for tags in tag_lists])
+    
+    def test_should_match_everything_without_expressions(self):
+        tools.eq_(TagExpression([]).eval_many([['@foo'], []]), [True, True])